@@ -0,0 +1,580 @@
+"""
+DATA DELIVERY BY ENERGY CONSTRAINED MOBILE AGENTS ON A LINE PROBLEM (DDLP)
+
+This code contains the Backtrack algorithm: a depth first search for a
+certificate that moves the data from the source to the target.
+
+At every node the robots in the left triangle are moved first (left
+triangle strategy), then each robot in the right triangle is a child.
+The search uses an explicit stack, robot indices, and undoes the moves
+in place, so it has no recursion limit and no global state.
+
+Different orders of the same moves reach the same state, so the failed
+states are kept in a transposition table: a node is pruned when a state
+with the same key (see ActiveRegion) and a data position as far or
+farther has already been explored without reaching the target.
+
+Instances proved unsolvable by the bounds in DDLP_Bounds are rejected
+before the search, and nodes are cut when the data cannot reach the
+target with the robots left.
+
+The children are explored in random order by default, ORDERS has other
+orders: static ones by the keys of the greedy heuristics, a one step
+lookahead, and the same orders for the first child only, then random.
+
+The run time of the search depends on the random order of the children,
+so restartBacktrack caps the nodes of every attempt, following a Luby or
+geometric schedule, and starts again with a new order until a global
+budget runs out.
+
+parallelBacktrack expands the tree breadth first to a frontier of many more
+branches than workers, and the workers take the next branch as they become
+idle. The first certificate found cancels the search in every worker.
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+from collections import OrderedDict, deque
+from multiprocessing import Pool, Event
+from DataDelivery import DataDelivery, ActiveRegion, readFile
+from DDLP_Bounds import infeasibilityReason, nodeInfeasibility, reached
+from DDLP_Heuristic import RIGHT_KEYS
+
+TABLE_SIZE = 2**18 # default number of states kept by a transposition table
+UNIT = 32 # default number of nodes of the shortest attempt of restartBacktrack
+BRANCHES = 16 # default number of branches per worker of parallelBacktrack
+CANCEL_CHECK = 256 # nodes between checks of the cancellation of a search
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def leftClosure(ddlp_instance, region):
+	"""
+	Moves the robots in the left triangle (left triangle strategy),
+	updating the active region. Returns data's new position.
+	"""
+
+	while len(region.left) > 0:
+		robot = min(region.left)
+		ddlp_instance.move(robot)
+		region.remove(robot)
+		region.update(ddlp_instance.data())
+
+	return ddlp_instance.data()
+
+
+def luby(i):
+	"""
+	i-th term (from 1) of the Luby sequence: 1, 1, 2, 1, 1, 2, 4, 1, ...
+	"""
+
+	k = 1
+	while (1 << k) - 1 < i:
+		k += 1
+	while i != (1 << k) - 1:
+		# i is in a copy of the sequence before 2^(k-1)
+		i -= (1 << (k - 1)) - 1
+		k = 1
+		while (1 << k) - 1 < i:
+			k += 1
+
+	return 1 << (k - 1)
+
+
+def geometric(i, ratio = 2):
+	"""
+	i-th term (from 1) of the geometric sequence: 1, 2, 4, 8, ...
+	"""
+
+	return ratio**(i - 1)
+
+
+# restart schedules, multiples of the length of the shortest attempt
+SCHEDULES = {'luby': luby, 'geometric': geometric}
+
+#******************************************************************************
+# CHILD ORDERS
+#******************************************************************************
+
+def randomOrder(children, ddlp_instance, region, rng):
+	"""
+	Children in random order.
+	"""
+
+	rng.shuffle(children)
+
+
+def staticOrder(key):
+	"""
+	Returns the order of the children by key(x, rho), smallest first, ties
+	by index. The keys do not depend on data (see RIGHT_KEYS).
+	"""
+
+	def order(children, ddlp_instance, region, rng):
+		positions = region.positions
+		energies = region.energies
+		children.sort(key = lambda i: key(positions[i], energies[i]))
+
+	return order
+
+
+def lookaheadOrder(children, ddlp_instance, region, rng):
+	"""
+	Children by the data position reached moving the child and then the
+	left triangle, farthest first, ties by index.
+	"""
+
+	reached = {}
+	for robot in children:
+		mark = len(ddlp_instance.trail)
+		region.push()
+		ddlp_instance.move(robot)
+		region.remove(robot)
+		region.update(ddlp_instance.data())
+		reached[robot] = leftClosure(ddlp_instance, region)
+		ddlp_instance.rewind(mark)
+		region.pop()
+	children.sort(key = lambda i: -reached[i])
+
+
+def firstThenRandom(order):
+	"""
+	Returns an order with the first child of order, then the others in random order.
+	"""
+
+	def firstOrder(children, ddlp_instance, region, rng):
+		order(children, ddlp_instance, region, rng)
+		rest = children[1:]
+		rng.shuffle(rest)
+		children[1:] = rest
+
+	return firstOrder
+
+
+# orders of the children, by name: the static keys of the greedy heuristics,
+# plus max_s (farthest reach first, as the reverse heuristic); its hlr is
+# less_capacity. Every order but random also has a name+'+random' version.
+ORDERS = {'random': randomOrder, 'lookahead': lookaheadOrder, 'max_s': staticOrder(lambda x, rho: -(x + rho))}
+for name in RIGHT_KEYS:
+	ORDERS[name] = staticOrder(RIGHT_KEYS[name])
+for name in list(ORDERS.keys()):
+	if name != 'random':
+		ORDERS[name + '+random'] = firstThenRandom(ORDERS[name])
+
+#******************************************************************************
+# TRANSPOSITION TABLE CLASS
+#******************************************************************************
+
+class TranspositionTable(object):
+	"""
+	Failed states of a search: for every key, the farthest data position
+	from which the target was not reached. When full, the least recently
+	used key is evicted.
+	"""
+
+	def __init__(self, size = TABLE_SIZE):
+		"""
+		Initializing, size is the maximum number of keys (0 disables the table).
+		"""
+
+		self.size = size
+		self.states = OrderedDict()
+		self.evictions = 0
+
+
+	def dominated(self, key, data):
+		"""
+		Has a state with this key and data as far or farther already failed?
+		"""
+
+		best = self.states.pop(key, None)
+		if best == None:
+			return False
+		self.states[key] = best # most recently used
+
+		return data <= best
+
+
+	def store(self, key, data):
+		"""
+		Records that the state (key, data) failed.
+		"""
+
+		if self.size <= 0:
+			return
+
+		best = self.states.pop(key, None)
+		if best != None and best > data:
+			data = best
+		self.states[key] = data
+		if len(self.states) > self.size:
+			self.states.popitem(last = False)
+			self.evictions += 1
+
+
+	def __len__(self):
+		"""
+		Number of keys in the table.
+		"""
+
+		return len(self.states)
+
+#******************************************************************************
+# SEARCH STATISTICS CLASS
+#******************************************************************************
+
+class SearchStats(object):
+	"""
+	Statistics of a backtracking search.
+	"""
+
+	def __init__(self):
+		"""
+		Initializing.
+		"""
+
+		self.nodes = 0 # number of nodes explored
+		self.max_depth = 0 # maximum depth of the stack
+		self.solved = False # was the target reached?
+		self.limit_reached = False # was the search stopped by the node limit?
+		self.pruned = 0 # number of nodes pruned by the transposition table
+		self.bounded = 0 # number of nodes cut by the bounds
+		self.reason = None # name of the bound that rejected the instance before the search
+		self.attempts = 1 # number of attempts (restartBacktrack)
+		self.branches = 0 # number of branches of the frontier (parallelBacktrack)
+		self.cancelled = False # was the search cancelled?
+
+
+	def add(self, other):
+		"""
+		Accumulates the statistics of another attempt.
+		"""
+
+		self.nodes += other.nodes
+		self.max_depth = max(self.max_depth, other.max_depth)
+		self.pruned += other.pruned
+		self.bounded += other.bounded
+
+
+	def __str__(self):
+		"""
+		String representation.
+		"""
+
+		return "Nodes: " + str(self.nodes) + " Max depth: " + str(self.max_depth) + " Solved: " + str(self.solved) + " Limit reached: " + str(self.limit_reached) + " Pruned: " + str(self.pruned) + " Bounded: " + str(self.bounded) + " Rejected by: " + str(self.reason) + " Attempts: " + str(self.attempts) + " Branches: " + str(self.branches)
+
+#******************************************************************************
+# BACKTRACK
+#******************************************************************************
+
+def backtrack(ddlp_instance, target, limit = float('inf'), rng = random, table = None, bounds = True, order = 'random', cancel = None):
+	"""
+	Searches for a certificate to move the data of ddlp_instance to target.
+	The children of every node are explored in ORDERS[order] (random by
+	default, with rng).
+	The search stops after limit nodes (an int, they are never exceeded).
+	Failed states are kept in table (a new TranspositionTable if None), a
+	table can be shared by searches of the same instance and target.
+	If bounds, the instance and every node are checked with the bounds first.
+	The search stops when cancel (an Event, or None) is set, it is checked
+	every CANCEL_CHECK nodes.
+	The instance is left as it was given.
+	Output: certificate (list of robot indices, empty if none was found), SearchStats
+	"""
+
+	if order not in ORDERS:
+		raise ValueError("Unknown order: " + str(order))
+	sort = ORDERS[order]
+	stats = SearchStats()
+	if bounds and not reached(ddlp_instance.data(), target):
+		stats.reason = infeasibilityReason(ddlp_instance.robotsList(), ddlp_instance.data(), target)
+		if stats.reason != None:
+			return [], stats
+	if table == None:
+		table = TranspositionTable()
+	region = ActiveRegion(ddlp_instance)
+	trail = ddlp_instance.trail
+	root = len(trail)
+	# every frame: [children, index of next child, length of trail at node's entry]
+	stack = []
+
+	while True:
+		# enter a node, unless limit nodes were already explored
+		if stats.nodes >= limit:
+			stats.limit_reached = True
+			break
+		stats.nodes += 1
+		if cancel != None and stats.nodes % CANCEL_CHECK == 0 and cancel.is_set():
+			stats.cancelled = True
+			break
+		if reached(ddlp_instance.data(), target):
+			stats.solved = True
+			break
+		prune = False
+		if table.dominated(region.key, ddlp_instance.data()):
+			stats.pruned += 1
+			prune = True
+		elif bounds and nodeInfeasibility(region, target) != None:
+			stats.bounded += 1
+			prune = True
+		if prune:
+			if len(stack) == 0:
+				break
+			# undo the move that led to the pruned node
+			ddlp_instance.undo()
+			region.pop()
+		else:
+			region.push()
+			mark = len(trail)
+			if reached(leftClosure(ddlp_instance, region), target):
+				stats.solved = True
+				break
+			children = region.rightTriangle()
+			sort(children, ddlp_instance, region, rng)
+			stack.append([children, 0, mark])
+			stats.max_depth = max(stats.max_depth, len(stack))
+
+		# backtrack from exhausted nodes
+		while len(stack) > 0 and stack[-1][1] == len(stack[-1][0]):
+			children, next_child, mark = stack.pop()
+			ddlp_instance.rewind(mark)
+			region.pop()
+			# the node's state failed
+			table.store(region.key, ddlp_instance.data())
+			if len(stack) > 0:
+				# undo the move that led to the exhausted node
+				ddlp_instance.undo()
+				region.pop()
+
+		if len(stack) == 0:
+			break
+
+		# move to next child
+		frame = stack[-1]
+		robot = frame[0][frame[1]]
+		frame[1] += 1
+		region.push()
+		ddlp_instance.move(robot)
+		region.remove(robot)
+		region.update(ddlp_instance.data())
+
+	certificate = []
+	if stats.solved:
+		certificate = [move[0] for move in trail[root:]]
+	ddlp_instance.rewind(root)
+
+	return certificate, stats
+
+
+def restartBacktrack(ddlp_instance, target, budget, schedule = 'luby', unit = UNIT, rng = random, table = None, bounds = True, order = 'random'):
+	"""
+	Backtrack with restarts: the i-th attempt explores at most
+	unit*SCHEDULES[schedule](i) nodes (budget is an int), with a new random order of the
+	children (a static order only changes by the table, use its '+random'
+	version), until budget nodes have been explored in total. The attempts
+	share the transposition table, which only keeps states that failed
+	completely, so later attempts skip what earlier ones refuted.
+	The instance is left as it was given.
+	Output: certificate (empty if none was found), SearchStats of all the attempts
+	"""
+
+	if schedule not in SCHEDULES:
+		raise ValueError("Unknown schedule: " + str(schedule))
+	if table == None:
+		table = TranspositionTable()
+	stats = SearchStats()
+	stats.attempts = 0
+	certificate = []
+
+	while stats.nodes < budget:
+		stats.attempts += 1
+		limit = min(unit*SCHEDULES[schedule](stats.attempts), budget - stats.nodes)
+		certificate, attempt = backtrack(ddlp_instance, target, limit, rng, table, bounds, order)
+		stats.add(attempt)
+		stats.reason = attempt.reason
+		stats.solved = attempt.solved
+		# the attempt found a certificate or proved there is none
+		if not attempt.limit_reached:
+			break
+
+	stats.limit_reached = not stats.solved and stats.nodes >= budget and attempt.limit_reached
+
+	return certificate, stats
+
+#******************************************************************************
+# PARALLEL BACKTRACK
+#******************************************************************************
+
+# state of a worker process of parallelBacktrack, set by initBranch
+SEARCH = {}
+
+def branchFrontier(ddlp_instance, target, size, order = 'random', rng = random, stats = None):
+	"""
+	Expands the nodes of the search breadth first (left closure, then the
+	children in ORDERS[order]) until there are at least size open nodes.
+	Nodes cut by the bounds are dropped, the nodes expanded are counted in
+	stats (a SearchStats, or None).
+	The instance is left as it was given.
+	Output: certificate (if a node reached target, else empty), list of the
+	moves (robot indices) that lead to every open node
+	"""
+
+	if order not in ORDERS:
+		raise ValueError("Unknown order: " + str(order))
+	trail = ddlp_instance.trail
+	root = len(trail)
+	frontier = deque([[]])
+
+	while 0 < len(frontier) < size:
+		moves = frontier.popleft()
+		if stats != None:
+			stats.nodes += 1
+		ddlp_instance.moveRobots(moves)
+		region = ActiveRegion(ddlp_instance)
+		leftClosure(ddlp_instance, region)
+		if reached(ddlp_instance.data(), target):
+			certificate = [move[0] for move in trail[root:]]
+			ddlp_instance.rewind(root)
+			return certificate, []
+		moves = [move[0] for move in trail[root:]]
+		if nodeInfeasibility(region, target) == None:
+			children = region.rightTriangle()
+			ORDERS[order](children, ddlp_instance, region, rng)
+			for robot in children:
+				frontier.append(moves + [robot])
+		ddlp_instance.rewind(root)
+
+	return [], list(frontier)
+
+
+def initBranch(robots, source, spent, target, order, cancel):
+	"""
+	Initializes a worker process: its own copy of the instance, and a
+	transposition table shared by the branches it solves.
+	"""
+
+	SEARCH['instance'] = DataDelivery(robots, data = source, energy = spent)
+	SEARCH['target'] = target
+	SEARCH['order'] = order
+	SEARCH['cancel'] = cancel
+	SEARCH['table'] = TranspositionTable()
+
+
+def solveBranch(task):
+	"""
+	Searches the branch reached with the moves of task (moves, seed).
+	Output: certificate of the whole instance (empty if none), SearchStats
+	"""
+
+	moves, seed = task
+	if SEARCH['cancel'].is_set():
+		stats = SearchStats()
+		stats.cancelled = True
+		return [], stats
+
+	ddlp_instance = SEARCH['instance']
+	root = len(ddlp_instance.trail)
+	ddlp_instance.moveRobots(moves)
+	certificate, stats = backtrack(ddlp_instance, SEARCH['target'], rng = random.Random(seed), table = SEARCH['table'], order = SEARCH['order'], cancel = SEARCH['cancel'])
+	ddlp_instance.rewind(root)
+	if stats.solved:
+		certificate = moves + certificate
+
+	return certificate, stats
+
+
+def parallelBacktrack(ddlp_instance, target, workers, branches = None, order = 'random', seed = None):
+	"""
+	Backtrack on worker processes: the tree is expanded to a frontier of
+	branches (BRANCHES per worker by default), and every worker takes the
+	next branch when it is idle. The first certificate found cancels the
+	other searches, each worker keeps its own transposition table.
+	The instance is left as it was given.
+	Output: certificate (empty if none was found), SearchStats of all the branches
+	"""
+
+	if workers <= 1 or reached(ddlp_instance.data(), target):
+		return backtrack(ddlp_instance, target, rng = random.Random(seed), order = order)
+
+	stats = SearchStats()
+	stats.reason = infeasibilityReason(ddlp_instance.robotsList(), ddlp_instance.data(), target)
+	if stats.reason != None:
+		return [], stats
+	if branches == None:
+		branches = BRANCHES*workers
+	rng = random.Random(seed)
+	certificate, frontier = branchFrontier(ddlp_instance, target, branches, order, rng, stats)
+	stats.branches = len(frontier)
+	if len(certificate) > 0:
+		stats.solved = True
+		return certificate, stats
+
+	spent = [ddlp_instance.isEmpty(i) for i in range(ddlp_instance.size)]
+	tasks = [(moves, rng.randrange(2**31)) for moves in frontier]
+	cancel = Event()
+	pool = Pool(workers, initBranch, (ddlp_instance.robotsList(), ddlp_instance.data(), spent, target, order, cancel))
+	try:
+		for branch_certificate, branch_stats in pool.imap_unordered(solveBranch, tasks):
+			stats.add(branch_stats)
+			if branch_stats.solved:
+				certificate = branch_certificate
+				stats.solved = True
+				# the other workers stop at their next check
+				cancel.set()
+				break
+	except:
+		pool.terminate()
+		raise
+	else:
+		pool.close()
+	pool.join()
+
+	return certificate, stats
+
+#******************************************************************************
+# MAIN METHOD FOR TESTING
+#******************************************************************************
+
+def main():
+	"""
+	Solves a single instance, in parallel if workers > 1.
+	Input: list of robots in csv format, source and target.
+	"""
+
+	args = parse_args()
+	robots = readFile(args.infile1)
+	ddlp_instance = DataDelivery(robots, data = float(args.infile2))
+
+	if args.workers > 1:
+		certificate, stats = parallelBacktrack(ddlp_instance, float(args.infile3), args.workers, args.branches, args.order, args.seed)
+	else:
+		certificate, stats = backtrack(ddlp_instance, float(args.infile3), rng = random.Random(args.seed), order = args.order)
+
+	print "\nCertificate: ", certificate
+	print stats
+
+
+def parse_args():
+	"""
+	Parsing arguments.
+	"""
+
+	import argparse
+	parser = argparse.ArgumentParser()
+	parser.add_argument('infile1', help = 'robots list')
+	parser.add_argument('infile2', help = 'source')
+	parser.add_argument('infile3', help = 'target')
+	parser.add_argument('--workers', type = int, default = 1, help = 'number of worker processes')
+	parser.add_argument('--branches', type = int, default = None, help = 'number of branches of the frontier (BRANCHES per worker by default)')
+	parser.add_argument('--order', default = 'random', choices = sorted(ORDERS.keys()), help = 'order of the children')
+	parser.add_argument('--seed', type = int, default = None, help = 'seed of the order of the search')
+
+	return parser.parse_args()
+
+
+if __name__ == '__main__':
+	main()
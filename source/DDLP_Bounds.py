@@ -0,0 +1,100 @@
+"""
+This module contains cheap proofs that a DDLP instance cannot be solved:
+upper bounds on the farthest position the data can reach. If a bound is
+below the target, the instance is a NO instance and the search is skipped.
+
+Robot i moves data d only if |d - x_i| < rho_i, and then the data lands
+at d + rho_i - |d - x_i|, which is at most x_i + rho_i and at most d + rho_i.
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+from DDLP_Connectivity import simmetricIntervals
+
+EPSILON = 1e-9 # relative margin for the rounding of incremental energy sums
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def reached(data, target):
+	"""
+	Has the data reached target? Up to the relative margin EPSILON, so that
+	the solvers and the bounds agree at the boundary (works on NumPy arrays).
+	"""
+
+	return data >= target - EPSILON*abs(target)
+
+#******************************************************************************
+# BOUNDS
+#******************************************************************************
+
+def reachBound(robots, source):
+	"""
+	The data never goes beyond the largest x_i + rho_i.
+	"""
+
+	return max([source] + [robot[0] + robot[1] for robot in robots])
+
+
+def coverageBound(robots, source):
+	"""
+	The data never leaves the connected component of the union of the open
+	intervals (x_i - rho_i, x_i + rho_i) that contains source.
+	Sweeps the intervals sorted by x_i - rho_i, O(n log n).
+	"""
+
+	reach = source
+	for a, b in sorted(simmetricIntervals(robots)):
+		if a >= reach:
+			break
+		if b > reach:
+			reach = b
+
+	return reach
+
+
+def energyBound(robots, source):
+	"""
+	Every move advances the data at most rho_i, and robots with
+	x_i + rho_i <= source are useless.
+	"""
+
+	return source + sum([robot[1] for robot in robots if robot[0] + robot[1] > source])
+
+# cheapest first
+BOUNDS = [('reach', reachBound), ('coverage', coverageBound), ('energy', energyBound)]
+
+#******************************************************************************
+# NO CERTIFICATES
+#******************************************************************************
+
+def infeasibilityReason(robots, source, target):
+	"""
+	Checks the bounds of a DDLP instance.
+	Output: name of the first bound below target, None if none is.
+	"""
+
+	for name, bound in BOUNDS:
+		if not reached(bound(robots, source), target):
+			return name
+
+	return None
+
+
+def nodeInfeasibility(region, target):
+	"""
+	Checks the bounds at a node of the search, in O(depth), with the
+	active region of its state.
+	Output: name of the first bound below target, None if none is.
+	"""
+
+	if not reached(region.reach(), target):
+		return 'reach'
+
+	if not reached(region.data + region.energy*(1 + EPSILON), target):
+		return 'energy'
+
+	return None
@@ -6,6 +6,8 @@ Created: October 5th 2018
 
 __author__ = 'Caleb Andrade'
 
+import numpy as np
+
 #******************************************************************************
 # HELPER FUNCTIONS
 #******************************************************************************
@@ -38,6 +40,44 @@ def simmetricIntervals(robots):
 	return intervals
 
 
+def criticalRadii(positions, energies, iterations = 64):
+	"""
+	Critical radius of every instance of a batch: the smallest r such that
+	the simmetric intervals (x_i - e_i*r, x_i + e_i*r) have a connected
+	interval graph, positions and energies being (trials, n) arrays.
+
+	With the robots sorted by x_i, the graph is connected iff at every cut
+	between consecutive robots the left intervals reach the right ones:
+	max(x_i + e_i*r, i <= k) >= min(x_j - e_j*r, j > k). Every check is a
+	prefix maximum and a suffix minimum, so after the O(n log n) sort the
+	radius is bisected to machine precision with O(n) vectorized steps.
+	Output: array of shape (trials,), inf for instances without robots.
+	"""
+
+	order = np.argsort(positions, axis = 1, kind = 'mergesort')
+	x = np.take_along_axis(positions, order, axis = 1)
+	e = np.take_along_axis(energies, order, axis = 1)
+	trials, n = x.shape
+	if n == 0:
+		return np.full(trials, np.inf)
+
+	def connected(r):
+		left = np.maximum.accumulate(x + e*r[:, np.newaxis], axis = 1)
+		right = np.minimum.accumulate((x - e*r[:, np.newaxis])[:, ::-1], axis = 1)[:, ::-1]
+		return np.all(left[:, :-1] >= right[:, 1:], axis = 1)
+
+	# the robot with the most energy alone covers all the others at high
+	low = np.zeros(trials)
+	high = (x[:, -1] - x[:, 0])/np.maximum(e.max(axis = 1), np.finfo(float).tiny)
+	for step in range(iterations):
+		middle = (low + high)/2
+		reached = connected(middle)
+		high = np.where(reached, middle, high)
+		low = np.where(reached, low, middle)
+
+	return np.where(connected(low), low, high)
+
+
 def backPercentage(ddlp_instance, certificate):
 	"""
 	Computes "a" in the asymmetric model.
@@ -59,7 +99,7 @@ def backPercentage(ddlp_instance, certificate):
 			percentages.append(round(percentage,2))
 		else:
 			percentages.append(0.0)
-		ddlp_instance.move(robots[i])
+		ddlp_instance.move(i)
 		position = ddlp_instance.data()
 		
 	ddlp_instance.reset()
@@ -74,19 +114,23 @@ def backPercentage(ddlp_instance, certificate):
 class IntervalGraph(object):
 	"""
 	Class to represent an interval graph.
+	The components are computed with a sweep of the sorted endpoints, O(n log n),
+	the adjacency list (O(n^2) for dense instances) is built only if requested.
 	"""
 
-	def __init__(self, intervals):
+	def __init__(self, intervals, adjacency = False):
 		"""
-		Initializing.
+		Initializing. If adjacency, the adjacency list is built right away.
 		"""
 		self.size = len(intervals) # number of vertices
 		self.marked = [False for i in range(self.size)]
 		self.component = [i for i in range(self.size)]
 		self.count = 0 # number of connected components
-		self.graph = [[] for i in range(self.size)] # graph initialization
+		self.adjacency = None # adjacency list, built by graph
 		self.intervals = intervals
 		self.graphInit(intervals)
+		if adjacency:
+			self.graph # builds the adjacency list
 
 	def __str__(self):
 		"""
@@ -101,43 +145,54 @@ class IntervalGraph(object):
 
 	def graphInit (self, intervals):
 		"""
-		Interval Graph construction.
+		Connected components of the interval graph.
 		"""
-		event_queue = []
+		# endpoints of the intervals: (position, 0 for start and 1 for end, interval),
+		# at equal positions starts go first so touching intervals intersect
+		self.events = []
 		for i in range(len(intervals)):
-			# store intervals endpoints in queue and name them
-			event_queue.append((intervals[i][0],'a', i))
-			event_queue.append((intervals[i][1],'b', i))
-
+			self.events.append((intervals[i][0], 0, i))
+			self.events.append((intervals[i][1], 1, i))
+		self.events.sort()
 
-		# sort event queue to process events
-		event_queue.sort(key = lambda value: value[1])
-		event_queue.sort(key = lambda value: value[0])
-
-		intersections = set([]) # intervals that intersect with each oter
+		intersections = 0 # number of intervals that contain the sweep position
 		# process events
-		for event in event_queue:
+		for position, end, i in self.events:
 			# check if event is a start point
-			if event[1] == 'a':
-				# create edges in adjacency list for all interval crossings
-				for interval_id in intersections:	
-					self.graph[event[2]].append(interval_id)
-					self.graph[interval_id].append(event[2])
-				
-				intersections.add(event[2])
+			if not end:
+				intersections += 1
 
 				# mark the connected components
-				self.component[event[2]] = self.count
-				self.marked[event[2]] = True
+				self.component[i] = self.count
+				self.marked[i] = True
 
-			# if event is an endpoint, pop interval from intersections set
-			if event[1] == 'b':
-				intersections.remove(event[2])
+			# if event is an endpoint, the interval leaves the sweep
+			else:
+				intersections -= 1
 
-				# if intersection set becomes empty, increase count of components
-				if len(intersections) == 0:
+				# if no interval contains the sweep, increase count of components
+				if intersections == 0:
 					self.count += 1
 
+	@property
+	def graph(self):
+		"""
+		Adjacency list of the interval graph, built on first use.
+		"""
+		if self.adjacency == None:
+			self.adjacency = [[] for i in range(self.size)]
+			intersections = set([]) # intervals that intersect with each other
+			for position, end, i in self.events:
+				if not end:
+					# create edges in adjacency list for all interval crossings
+					for interval_id in intersections:
+						self.adjacency[i].append(interval_id)
+						self.adjacency[interval_id].append(i)
+					intersections.add(i)
+				else:
+					intersections.remove(i)
+
+		return self.adjacency
 	
 	def getComponents(self):
 		"""
@@ -8,7 +8,9 @@ Last update: Decembr 13th 2020
 """
 
 import random
-from DataDelivery import DataDelivery, readFile, objectiveValue, dataTriangle
+import heapq
+import numpy as np
+from DataDelivery import DataDelivery, ActiveRegion, readFile, objectiveValue, dataTriangle
 from Tkinter import Tk, Canvas
 
 __author__ = 'Caleb Andrade'
@@ -215,52 +217,311 @@ def brutePair(triangle, data):
 	return best_robot
 	
 
+#******************************************************************************
+# TRIANGLE HEAPS CLASS
+#******************************************************************************
+
+# Keys of the greedy strategies for the right triangle (x_i > data), smallest first.
+# They do not depend on data: |data - x_i| = x_i - data, so the capacity
+# rho_i - |data - x_i| is data - (x_i - rho_i).
+RIGHT_KEYS = {
+	'closest_robot': lambda x, rho: x,
+	'lowest_reach': lambda x, rho: x + rho,
+	'highest_capacity': lambda x, rho: x - rho,
+	'less_capacity': lambda x, rho: rho - x}
+
+class TriangleHeaps(object):
+	"""
+	Priority queues of the triangles of an ActiveRegion, for the greedy
+	strategies. A robot is pushed when the region's pointers pass it, and
+	robots that left the triangle are dropped lazily when they reach the top.
+	Left triangle robots are keyed by -(x_i + rho_i): their capacity is
+	x_i + rho_i - data. Ties go to the smallest index.
+	"""
+
+	def __init__(self, region, key = None):
+		"""
+		Initializing, key(x, rho) orders the right triangle (None: no right heap).
+		"""
+
+		self.region = region
+		self.key = key
+		self.left = []
+		self.right = []
+		self.head = self.mid = 0
+		self.sync()
+
+
+	def sync(self):
+		"""
+		Pushes the robots passed by the region's pointers since the last call.
+		"""
+
+		region = self.region
+		while self.mid < region.mid:
+			i = region.middles[self.mid]
+			heapq.heappush(self.left, (-region.upper[i], i))
+			self.mid += 1
+		while self.head < region.head:
+			i = region.starts[self.head]
+			if self.key != None:
+				heapq.heappush(self.right, (self.key(region.positions[i], region.energies[i]), i))
+			self.head += 1
+
+
+	def best(self, heap, triangle):
+		"""
+		Returns the top robot of heap that is still in triangle (None if empty).
+		"""
+
+		while len(heap) > 0 and heap[0][1] not in triangle:
+			heapq.heappop(heap)
+		if len(heap) == 0:
+			return None
+
+		return heap[0][1]
+
+
+	def bestLeft(self):
+		"""
+		Returns the robot of highest capacity in the left triangle.
+		"""
+
+		return self.best(self.left, self.region.left)
+
+
+	def bestRight(self):
+		"""
+		Returns the first robot of the right triangle by key.
+		"""
+
+		return self.best(self.right, self.region.right)
+
+#******************************************************************************
+# ACTIVE SAMPLE CLASS
+#******************************************************************************
+
+class ActiveSample(object):
+	"""
+	The robots of both triangles of an ActiveRegion in a list, with their
+	positions in it, to sample one uniformly and remove it in O(1).
+	"""
+
+	def __init__(self, region):
+		"""
+		Initializing.
+		"""
+
+		self.region = region
+		self.robots = []
+		self.where = {}
+		self.head = self.tail = 0
+		self.sync()
+
+
+	def discard(self, i):
+		"""
+		Removes robot i if present (swapping it with the last one).
+		"""
+
+		k = self.where.pop(i, None)
+		if k == None:
+			return
+		last = self.robots.pop()
+		if last != i:
+			self.robots[k] = last
+			self.where[last] = k
+
+
+	def sync(self, moved = None):
+		"""
+		Follows the region's pointers since the last call: adds the robots
+		that became active and discards the moved and the useless ones.
+		"""
+
+		region = self.region
+		if moved != None:
+			self.discard(moved)
+		while self.head < region.head:
+			i = region.starts[self.head]
+			if i in region.left or i in region.right:
+				self.where[i] = len(self.robots)
+				self.robots.append(i)
+			self.head += 1
+		while self.tail < region.tail:
+			self.discard(region.ends[self.tail])
+			self.tail += 1
+
+
+	def sample(self):
+		"""
+		Returns a random robot of the triangles (None if both are empty).
+		"""
+
+		if len(self.robots) == 0:
+			return None
+
+		return random.choice(self.robots)
+
+#******************************************************************************
+# PAIR STRATEGIES (NUMPY)
+#******************************************************************************
+
+# The following strategies choose in the right triangle, given as an array of
+# robot indices, with the positions x and energies rho of all the robots.
+# They are the vectorized versions of bestRobot, pairHeuristic, brutePair and
+# quotientHeuristic, and fall back to the first robot when those find none.
+
+def pairValues(x, rho, data):
+	"""
+	Returns the matrix of twoRobots: entry (i, j) is the data after robot i
+	and then robot j move it.
+	"""
+
+	data_i = data + rho - np.abs(x - data)
+
+	return data_i[:, np.newaxis] + rho[np.newaxis, :] - np.abs(x[np.newaxis, :] - data_i[:, np.newaxis])
+
+
+def brutePairChoice(triangle, x, rho, region, data):
+	"""
+	The robot that goes first in the best ordered pair (brutePair).
+	"""
+
+	if len(triangle) < 2:
+		return triangle[0]
+	values = pairValues(x[triangle], rho[triangle], data)
+	np.fill_diagonal(values, -np.inf)
+	best = np.argmax(values)
+	if values.flat[best] <= 0:
+		return triangle[0]
+
+	return triangle[best // len(triangle)]
+
+
+def pairHeuristicChoice(triangle, x, rho, region, data):
+	"""
+	The winner of the sequence of comparisons of pairHeuristic: every
+	comparison evaluates only its two ordered pairs, O(k).
+	"""
+
+	positions = x[triangle].tolist()
+	energies = rho[triangle].tolist()
+	# data after every robot moves it
+	moved = (data + rho[triangle] - np.abs(x[triangle] - data)).tolist()
+	best = 0
+	for k in range(len(triangle)):
+		# is robot k then best farther than best then robot k?
+		if moved[k] + energies[best] - abs(positions[best] - moved[k]) > moved[best] + energies[k] - abs(positions[k] - moved[best]):
+			best = k
+
+	return triangle[best]
+
+
+def quotientChoice(triangle, x, rho, region, data):
+	"""
+	The robot of largest (y - |x - d|)/|x - d| (quotientHeuristic).
+	"""
+
+	delta = np.abs(x[triangle] - data)
+	quotient = np.full(len(triangle), -np.inf)
+	positive = delta > 0
+	quotient[positive] = (rho[triangle][positive] - delta[positive])/delta[positive]
+	best = np.argmax(quotient)
+	if quotient[best] <= 0:
+		return triangle[0]
+
+	return triangle[best]
+
+
+def bestRobotChoice(triangle, x, rho, region, data):
+	"""
+	The robot that maximizes the new data plus the remaining capacities of
+	the robots active after it moves (bestRobot). The robots that can be
+	active after a move are those active now and those that become active
+	before the farthest new data.
+	"""
+
+	new_data = data + rho[triangle] - np.abs(x[triangle] - data)
+	farthest = new_data.max()
+	others = list(region.left) + list(region.right)
+	rank = region.head
+	while rank < region.size and region.lower[region.starts[rank]] < farthest:
+		if not region.removed[region.starts[rank]]:
+			others.append(region.starts[rank])
+		rank += 1
+	others = np.array(others, int)
+	lower = x[others] - rho[others]
+	upper = x[others] + rho[others]
+	capacity = rho[others][np.newaxis, :] - np.abs(x[others][np.newaxis, :] - new_data[:, np.newaxis])
+	active = (lower[np.newaxis, :] < new_data[:, np.newaxis]) & (new_data[:, np.newaxis] < upper[np.newaxis, :])
+	active &= others[np.newaxis, :] != triangle[:, np.newaxis]
+	values = np.sum(np.where(active, capacity, 0), axis = 1) + new_data
+	best = np.argmax(values)
+	if values[best] <= 0:
+		return triangle[0]
+
+	return triangle[best]
+
+PAIR_STRATEGIES = {
+	'best_robot': bestRobotChoice,
+	'pair_heuristic': pairHeuristicChoice,
+	'brute_pair': brutePairChoice,
+	'quotient': quotientChoice}
+
 #******************************************************************************
 # HEURISTIC
 #******************************************************************************
 
 def greedyHeuristic(ddlp_instance, heuristic):
 	"""
-	Returns a greedy certificate, according to different strategies.
+	Returns a greedy certificate (robot indices), according to different strategies.
+	The robots in the left triangle go first, by highest capacity, then the
+	strategy chooses in the right triangle, from heaps updated as the data
+	advances, O(n log n). The pair strategies (PAIR_STRATEGIES) evaluate
+	the right triangle with NumPy at every step instead.
 	"""
 	certificate = []
-	robots = ddlp_instance.robotsList()
+	region = ActiveRegion(ddlp_instance)
 	data = ddlp_instance.data()
-	finish = False
+	if heuristic == 'random_sampling':
+		heaps = None
+		active = ActiveSample(region)
+	elif heuristic in RIGHT_KEYS:
+		heaps = TriangleHeaps(region, RIGHT_KEYS[heuristic])
+	elif heuristic in PAIR_STRATEGIES:
+		heaps = TriangleHeaps(region)
+		choice = PAIR_STRATEGIES[heuristic]
+		x = np.array(region.positions)
+		rho = np.array(region.energies)
+	else:
+		raise ValueError("Unknown heuristic: " + str(heuristic))
 
-	while not finish:
-		# select robots in the triangle
-		left_triangle, right_triangle = dataTriangle(data, robots)
+	while True:
 		# random sampling
-		if heuristic == 'random_sampling':
-			active_region = left_triangle + right_triangle
-			if len(active_region) > 0:
-				robot = random.choice(active_region)
-			else:
-				finish = True
-				break
-		# process robots to the left
-		elif len(left_triangle) > 0:
-			robot = highestCapacity(data, left_triangle)
-		# process robots to the right
-		elif len(right_triangle) > 0:
-			if heuristic == 'closest_robot':
-				robot = closestRobot(data, right_triangle)
-			if heuristic == 'lowest_reach':
-				robot = lowestReach(right_triangle)
-			if heuristic == 'highest_capacity':
-				robot = highestCapacity(data, right_triangle)
-			if heuristic == 'less_capacity':
-				robot = lessCapacity(data, right_triangle)
+		if heaps == None:
+			robot = active.sample()
 		else:
-			# if both triangles are empty, finish
-			finish = True
+			# process robots to the left, then to the right
+			robot = heaps.bestLeft()
+			if robot == None and heuristic in PAIR_STRATEGIES:
+				if len(region.right) > 0:
+					robot = int(choice(np.array(region.rightTriangle(), int), x, rho, region, data))
+			elif robot == None:
+				robot = heaps.bestRight()
+		# if both triangles are empty, finish
+		if robot == None:
 			break
 
 		certificate.append(robot)
 		ddlp_instance.move(robot)
 		data = ddlp_instance.data()
-		robots.remove(robot)
+		region.remove(robot)
+		region.update(data)
+		if heaps == None:
+			active.sync(robot)
+		else:
+			heaps.sync()
 	
 	ddlp_instance.reset()
 
@@ -314,7 +575,7 @@ def main():
 	print "Sorted robots: ", robots
 	ddlp_instance =  DataDelivery(robots)
 	print "\nTesting greedyHeuristic. Expected output: "
-	print "[(-0.5,3), (2,2), (5,2), (6,2)]"
+	print "[1, 10, 12, 13]"
 	print greedyHeuristic(ddlp_instance, 'closest_robot')
 
 	print "\nTesting brute pair"
@@ -322,11 +583,17 @@ def main():
 	# sort robots with respect to x_i - rho_i
 	robots.sort(key = lambda robot: robot[0] - robot[1])
 	ddlp_instance = DataDelivery(robots)
-	print greedyHeuristic(ddlp_instance, 'brutePair')
+	print greedyHeuristic(ddlp_instance, 'brute_pair')
 
 	print "\nTesting pair heuristic"
-	print greedyHeuristic(ddlp_instance, 'pairHeuristic')
+	print greedyHeuristic(ddlp_instance, 'pair_heuristic')
+
+	print "\nTesting best robot"
+	print greedyHeuristic(ddlp_instance, 'best_robot')
+
+	print "\nTesting quotient heuristic"
+	print greedyHeuristic(ddlp_instance, 'quotient')
 
 
 if __name__ == '__main__':	
-	main() 
\ No newline at end of file
+	main() 
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+This module reduces a DDLP instance, before solving it, to an equivalent
+smaller instance (kernel), with the mapping of its robots back to the
+original indices, so that certificates are reported for the original input.
+
+Robot i moves data d only if x_i - rho_i < d < x_i + rho_i, and then the
+data lands at min(x_i + rho_i, 2d - (x_i - rho_i)). The reductions are exact:
+
+useless: robots with x_i + rho_i <= source never move the data.
+
+left closure: robots with x_i <= source move the data to x_i + rho_i, and
+the one with the largest x_i + rho_i makes the others useless. They are
+moved first (left triangle strategy, as Backtrack does at every node), and
+the source advances, until no robot is to the left of it.
+
+unreachable: the data never leaves the connected component of the union
+of the intervals (x_i - rho_i, x_i + rho_i) that contains the source (see
+coverageBound), so the robots beyond the first coverage gap never become
+active, and neither do those with x_i - rho_i >= target.
+
+Containment of intervals is not a reduction: two robots with the same
+interval may both be needed, each one moving the data a part of the way.
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import heapq
+from DDLP_Bounds import reached
+
+#******************************************************************************
+# KERNEL CLASS
+#******************************************************************************
+
+class Kernel(object):
+	"""
+	Reduced DDLP instance: robots (list of (x_i, rho_i)) and source, equivalent
+	to the original instance after moving the robots of prefix. Robot i of the
+	kernel is robot indices[i] of the original instance.
+	"""
+
+	def __init__(self, robots, source, indices, prefix, useless, unreachable):
+		"""
+		Initializing.
+		"""
+
+		self.robots = robots
+		self.source = source
+		self.indices = indices
+		self.prefix = prefix # original indices moved by the left closure
+		self.useless = useless # number of useless robots removed
+		self.unreachable = unreachable # number of unreachable robots removed
+
+
+	def certificate(self, certificate):
+		"""
+		Maps a certificate of the kernel to a certificate of the original instance.
+		"""
+
+		return self.prefix + [self.indices[i] for i in certificate]
+
+
+	def __len__(self):
+		"""
+		Number of robots in the kernel.
+		"""
+
+		return len(self.robots)
+
+
+	def __str__(self):
+		"""
+		String representation.
+		"""
+
+		return "Kernel robots: " + str(len(self.robots)) + " Source: " + str(self.source) + " Left closure: " + str(len(self.prefix)) + " Useless: " + str(self.useless) + " Unreachable: " + str(self.unreachable)
+
+#******************************************************************************
+# KERNELIZATION
+#******************************************************************************
+
+def kernelize(robots, source, target):
+	"""
+	Reduces the instance (robots, source) with target, O(n log n).
+	Input: a list of robots (x_i, rho_i) or a NumPy (n, 2) array.
+	Output: Kernel
+	"""
+
+	if hasattr(robots, 'shape'):
+		robots = robots.tolist()
+	size = len(robots)
+	upper = [robot[0] + robot[1] for robot in robots]
+	by_position = sorted(range(size), key = lambda i: robots[i][0])
+	prefix = []
+	# robots to the left of the source, by largest x_i + rho_i
+	heap = []
+	rank = 0
+	while not reached(source, target):
+		while rank < size and robots[by_position[rank]][0] <= source:
+			i = by_position[rank]
+			heapq.heappush(heap, (-upper[i], i))
+			rank += 1
+		if len(heap) == 0 or -heap[0][0] <= source:
+			break
+		i = heapq.heappop(heap)[1]
+		prefix.append(i)
+		source = upper[i]
+
+	left = set(prefix)
+	for item in heap:
+		left.add(item[1])
+	left.update(by_position[:rank])
+	# robots not moved: useless, or to the right of the source
+	rest = [i for i in range(size) if i not in left]
+	useful = [i for i in rest if upper[i] > source]
+	if reached(source, target):
+		# solved by the left closure
+		useful = []
+	useless = size - len(prefix) - len(useful)
+
+	# end of the coverage from the source (coverageBound), up to target
+	reach = source
+	for i in sorted(useful, key = lambda i: robots[i][0] - robots[i][1]):
+		if robots[i][0] - robots[i][1] >= min(reach, target):
+			break
+		reach = max(reach, upper[i])
+	indices = [i for i in useful if robots[i][0] - robots[i][1] < min(reach, target)]
+	unreachable = len(useful) - len(indices)
+
+	return Kernel([tuple(robots[i]) for i in indices], source, indices, prefix, useless, unreachable)
@@ -9,6 +9,7 @@ __author__ = 'Caleb Andrade'
 
 import random
 import math
+import numpy as np
 
 #******************************************************************************
 # HELPER FUNCTIONS
@@ -33,6 +34,68 @@ def randomRobotGenerator(width, radius, number_robots):
 	return robots
 
 
+def makeGenerator(seed = None):
+	"""
+	Returns a NumPy random generator seeded with seed. It is a
+	numpy.random.Generator when available, otherwise a RandomState.
+	"""
+
+	if hasattr(np.random, 'default_rng'):
+		return np.random.default_rng(seed)
+
+	return np.random.RandomState(seed)
+
+
+def uniforms(generator, shape):
+	"""
+	Draws an array of the given shape of uniforms in [0, 1) from generator.
+	"""
+
+	if hasattr(generator, 'random_sample'):
+		return generator.random_sample(shape)
+
+	return generator.random(shape)
+
+
+def sortBatch(batch):
+	"""
+	Sorts in place every instance of a (trials, n, 2) batch with respect 
+	to x_i - rho_i. Output: the sorted batch.
+	"""
+
+	order = np.argsort(batch[:, :, 0] - batch[:, :, 1], axis = 1, kind = 'mergesort')
+	batch[:] = np.take_along_axis(batch, order[:, :, np.newaxis], axis = 1)
+
+	return batch
+
+
+def randomRobotBatch(width, radius, number_robots, trials, generator):
+	"""
+	Generates trials instances of number_robots robots with uniform 
+	distribution in a rectangle of size width x radius, in a single draw.
+	Output: array of shape (trials, number_robots, 2), every instance sorted
+	with respect to x_i - rho_i. batch[t] is a zero-copy (n, 2) view that
+	DataDelivery takes directly.
+	"""
+
+	batch = uniforms(generator, (trials, number_robots, 2))
+	batch[:, :, 0] *= width
+	batch[:, :, 1] *= radius
+
+	return sortBatch(batch)
+
+
+def scaledBatch(units, width, radius):
+	"""
+	Scales a (trials, n, 2) batch of uniforms in [0, 1) to a rectangle of
+	size width x radius, without modifying units. Lets the same draw be
+	solved at different radii.
+	Output: a new batch, every instance sorted with respect to x_i - rho_i.
+	"""
+
+	return sortBatch(units*np.array([width, radius]))
+
+
 def robotDisplacement(ddlp_instance, certificate, radius):
 	"""
 	Computes robot displacement as a percentage of r (radius).
@@ -40,14 +103,13 @@ def robotDisplacement(ddlp_instance, certificate, radius):
 
 	displacements = []
 	positions = [ddlp_instance.data()]
-	robots = ddlp_instance.robotsList()
 
 	# Sanity check
 	if len(certificate) == 0:
 		return displacements
 
 	for i in certificate:
-		ddlp_instance.move(robots[i])
+		ddlp_instance.move(i)
 		new_position = ddlp_instance.data()
 		displacement = new_position - positions[-1]
 		displacements.append(round(displacement / radius, 2))
@@ -67,4 +129,130 @@ def variance(data, ddof=0):
 def stdev(data):
 	var = variance(data)
 	std_dev = math.sqrt(var)
-	return std_dev
\ No newline at end of file
+	return std_dev
+
+#******************************************************************************
+# COMMON RANDOM NUMBERS CLASS
+#******************************************************************************
+
+POOLS = {} # pool of uniforms of this process, by (seed, shape), only the last one is kept
+
+class CommonPool(object):
+	"""
+	A stand-in for a random generator (see uniforms) that hands out slices of
+	one pool of uniforms of shape (trials, n, 2): a draw of shape (t, m, 2)
+	returns the next t trials, each one cut to its first m robots. Cells that
+	share a pool share their instances up to scaling (common random numbers),
+	and the pool is drawn once per process; a pool of another seed or shape
+	replaces it.
+	"""
+
+	def __init__(self, seed, shape):
+		"""
+		Initializing, the pool is drawn from makeGenerator(seed) on first use.
+		"""
+
+		self.seed = seed
+		self.shape = tuple(shape)
+		self.offset = 0 # trials already handed out
+
+
+	def random_sample(self, shape):
+		"""
+		Returns a copy of the next shape[0] trials, cut to shape[1:].
+		"""
+
+		key = (self.seed, self.shape)
+		if key not in POOLS:
+			POOLS.clear()
+			POOLS[key] = uniforms(makeGenerator(self.seed), self.shape)
+		pool = POOLS[key]
+		if self.offset + shape[0] > self.shape[0] or any(shape[k] > self.shape[k] for k in range(1, len(shape))):
+			raise ValueError("A draw of shape " + str(tuple(shape)) + " does not fit in the pool " + str(self.shape))
+		sample = pool[self.offset:self.offset + shape[0], :shape[1], :shape[2]].copy()
+		self.offset += shape[0]
+
+		return sample
+
+#******************************************************************************
+# CONFIDENCE INTERVALS
+#******************************************************************************
+
+def wilsonInterval(successes, samples, z = 1.96):
+	"""
+	Wilson score interval of a binomial proportion, z is the normal quantile
+	(1.96 for 95%).
+	Output: (lower, upper)
+	"""
+
+	if samples == 0:
+		return 0.0, 1.0
+
+	p = float(successes)/samples
+	z2 = z*z
+	center = (p + z2/(2.0*samples))/(1 + z2/samples)
+	half = z/(1 + z2/samples)*math.sqrt(p*(1 - p)/samples + z2/(4.0*samples*samples))
+
+	return max(0.0, center - half), min(1.0, center + half)
+
+
+def binomialCDF(k, samples, p):
+	"""
+	Probability of at most k successes in samples trials with probability p.
+	"""
+
+	if k < 0:
+		return 0.0
+	if k >= samples or p <= 0:
+		return 1.0
+	if p >= 1:
+		return 0.0
+
+	log_p = math.log(p)
+	log_q = math.log(1 - p)
+	log_n = math.lgamma(samples + 1)
+	total = 0.0
+	for i in range(k + 1):
+		total += math.exp(log_n - math.lgamma(i + 1) - math.lgamma(samples - i + 1) + i*log_p + (samples - i)*log_q)
+
+	return min(1.0, total)
+
+
+def clopperPearsonInterval(successes, samples, z = 1.96):
+	"""
+	Clopper-Pearson (exact) interval of a binomial proportion, with the
+	confidence of the normal quantile z. The binomial tails are inverted
+	by bisection.
+	Output: (lower, upper)
+	"""
+
+	if samples == 0:
+		return 0.0, 1.0
+
+	alpha = math.erfc(z/math.sqrt(2))
+	lower = 0.0
+	if successes > 0:
+		# P(X >= successes | lower) = alpha/2
+		a, b = 0.0, 1.0
+		for step in range(60):
+			middle = (a + b)/2
+			if 1 - binomialCDF(successes - 1, samples, middle) < alpha/2:
+				a = middle
+			else:
+				b = middle
+		lower = a
+	upper = 1.0
+	if successes < samples:
+		# P(X <= successes | upper) = alpha/2
+		a, b = 0.0, 1.0
+		for step in range(60):
+			middle = (a + b)/2
+			if binomialCDF(successes, samples, middle) > alpha/2:
+				a = middle
+			else:
+				b = middle
+		upper = b
+
+	return lower, upper
+
+INTERVALS = {'wilson': wilsonInterval, 'clopper-pearson': clopperPearsonInterval}
\ No newline at end of file
@@ -9,6 +9,7 @@ February 25th 2021
 """
 
 import random
+import heapq
 from DataDelivery import DataDelivery, readFile, objectiveValue, upperBound
 #from DDLP_Drawing import drawHLR
 from DDLP_Random import randomRobotGenerator
@@ -44,6 +45,16 @@ def difference(robot, target):
 	"""
 	return (robot[0] + robot[1] - target)/2.0
 
+# Keys of the criteria, smallest first: (x, rho, index) -> key. The difference
+# s only depends on the target through a constant, so it is ordered by x + rho.
+# Ties go to the first robot, except for hlr that takes the last one.
+REVERSE_KEYS = {
+	"max_x": lambda x, rho, i: (-x, i),
+	"min_x": lambda x, rho, i: (x, i),
+	"max_s": lambda x, rho, i: (-(x + rho), i),
+	"min_s": lambda x, rho, i: (x + rho, i),
+	"hlr": lambda x, rho, i: (-(x - rho), -i)}
+
 #******************************************************************************
 # HEURISTIC
 #******************************************************************************
@@ -51,70 +62,50 @@ def difference(robot, target):
 def reverseHeuristic(robots, heuristic_type, source, target):
 	"""
 	Solves a DataDelivery instance constructively by selecting robots in
-	reverse order, according to four different criteria.
-	Returns certificate and targets.
+	reverse order, according to five different criteria.
+	Returns certificate (robot indices) and targets.
+
+	The candidates are the robots whose interval [x - rho, x + rho] covers
+	the target (x - rho < target <= x + rho). The target only decreases,
+	so robots enter the candidates once (sorted by x + rho) and leave once
+	(x - rho >= target, checked when they reach the top of the heap of the
+	criterion), O(n log n).
 	"""
 
-#	print "Criterion: ", heuristic_type
+	if heuristic_type not in REVERSE_KEYS:
+		raise ValueError("Unknown heuristic: " + str(heuristic_type))
+	key = REVERSE_KEYS[heuristic_type]
 
-	finish = False
-	available_robots = list(robots)
-#	print "Available robots: ", available_robots
+	# We round so as to deal with floating point arithmetic error
+	lower_reach = [round(robot[0] - robot[1],10) for robot in robots]
+	upper_reach = [round(robot[0] + robot[1],10) for robot in robots]
+	entering = sorted(range(len(robots)), key = lambda index: -upper_reach[index])
+	pointer = 0
+	heap = []
 	certificate = []
 	targets = []
 
-	while not finish:
-		candidates = []
-		
-		for robot in available_robots:
-			# We round so as to deal with floating point arithmetic error
-			lower_reach = round(robot[0] - robot[1],10)
-			upper_reach = round(robot[0] + robot[1],10)
-			if  lower_reach < round(target,10) <= upper_reach:
-				candidates.append(robot)
-
-		if len(candidates) == 0:
+	while True:
+		rounded_target = round(target,10)
+		while pointer < len(entering) and rounded_target <= upper_reach[entering[pointer]]:
+			index = entering[pointer]
+			heapq.heappush(heap, (key(robots[index][0], robots[index][1], index), index))
+			pointer += 1
+		while len(heap) > 0 and lower_reach[heap[0][1]] >= rounded_target:
+			heapq.heappop(heap)
+
+		if len(heap) == 0:
 #			print "No more candidates! There is no certificate!"
 			return [],[]
 
-		# Initialize values for comparison
-		max_x_robot = min_x_robot = max_s_robot = min_s_robot = hlr_robot = candidates[0]
-		max_x = min_x = candidates[0][0]
-		max_s = min_s = difference(candidates[0], target)
-		hlr = hlr_robot[0] - hlr_robot[1]
-
-		for robot in candidates:
-			s = difference(robot, target)
-#			print "Candidate robot: ", robot,
-#			print "S difference: ", s
-
-			max_x_robot, max_x = criterion(max_x_robot, robot, max_x, robot[0], "max")
-			min_x_robot, min_x = criterion(min_x_robot, robot, min_x, robot[0], "min")
-			max_s_robot, max_s = criterion(max_s_robot, robot, max_s, s, "max")
-			min_s_robot, min_s = criterion(min_s_robot, robot, min_s, s, "min")
-			if robot[0] - robot[1] >= hlr:
-				hlr = robot[0] - robot[1]
-				hlr_robot = robot
-
-		if heuristic_type == "max_x":
-			best_robot = max_x_robot
-		if heuristic_type == "min_x":
-			best_robot = min_x_robot
-		if heuristic_type == "max_s":
-			best_robot = max_s_robot
-		if heuristic_type == "min_s":
-			best_robot = min_s_robot
-		if heuristic_type == "hlr":
-			best_robot = hlr_robot
+		best_robot = heapq.heappop(heap)[1]
 
 #		print "Best robot: ",best_robot
 
-		target = best_robot[0] - difference(best_robot, target)
+		target = robots[best_robot][0] - difference(robots[best_robot], target)
 		certificate.append(best_robot)
 		targets.append(target)
 #		print "New target: ", target
-		available_robots.remove(best_robot)
-#		print "Available robots: ", available_robots
 
 		if target <= source:
 #			print "Solved! last target: ", target
@@ -198,4 +189,4 @@ def main():
 
 
 if __name__ == '__main__':	
-	main() 
\ No newline at end of file
+	main() 
\ No newline at end of file
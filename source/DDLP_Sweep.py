@@ -0,0 +1,463 @@
+"""
+This module runs the cells of a density plot grid, either one after the
+other or in a pool of worker processes.
+
+Every cell gets its own seed, derived only from the sweep seed and the
+cell's key, so the results do not depend on the number of workers nor on
+the order in which the cells are run.
+
+Finished cells can be persisted in an append-only checkpoint file, so that
+an interrupted sweep is resumed without running them again. Persistence is
+opt-in: a sweep without a checkpoint and without resume writes no file.
+
+With sequential stopping, a cell draws its instances in batches and stops
+as soon as the confidence interval of its probability is narrow enough.
+
+With common random numbers, every cell takes its instances from one pool
+of uniforms drawn from the sweep seed, instead of its own generator.
+
+A refined sweep starts with blocks of cells, runs one cell per block, and
+subdivides only the blocks near the phase transition.
+
+The options of a sweep are grouped in a SweepOptions object, shared by
+all the density plot scripts.
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import os
+import json
+import random
+from multiprocessing import Pool
+from DDLP_Random import makeGenerator, CommonPool, INTERVALS
+
+MASK = (1 << 64) - 1
+REPORTS = 20 # progress lines printed by a sweep
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def mix(value):
+	"""
+	Scrambles a 64 bit integer (splitmix64 finalizer).
+	"""
+
+	value = (value + 0x9E3779B97F4A7C15) & MASK
+	value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+	value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+
+	return value ^ (value >> 31)
+
+
+def cellSeed(seed, key):
+	"""
+	Returns the seed of the cell identified by key (a tuple of integers).
+	Output: a 32 bit integer.
+	"""
+
+	value = mix(seed & MASK)
+	for k in key:
+		value = mix(value ^ (k & MASK))
+
+	return value >> 32
+
+
+def progress(done, total):
+	"""
+	Prints the progress of a sweep, about REPORTS times in total.
+	"""
+
+	step = max(1, total//REPORTS)
+	if done % step == 0 or done == total:
+		print "Cells done: ", done, " of ", total
+
+
+def runCell(task):
+	"""
+	Runs the experiment of a single cell.
+	Input: task = (key, experiment, arguments, seed, pool), pool is None or
+	the (seed, shape) of the common pool of uniforms.
+	Output: (key, result)
+	"""
+
+	key, experiment, arguments, seed, pool = task
+	# seed both sources of randomness: the instance generator and the solvers' shuffles
+	random.seed(seed)
+	if pool == None:
+		generator = makeGenerator(seed)
+	else:
+		generator = CommonPool(*pool)
+	result = experiment(*arguments, generator = generator)
+
+	return key, result
+
+
+def jsonDefault(value):
+	"""
+	Converts NumPy scalars and arrays for json.
+	"""
+
+	if hasattr(value, 'tolist'):
+		return value.tolist()
+
+	raise TypeError(repr(value) + " is not JSON serializable")
+
+#******************************************************************************
+# CHECKPOINT CLASS
+#******************************************************************************
+
+class CheckpointError(ValueError):
+	"""
+	A checkpoint that cannot be used by a sweep: it would be overwritten,
+	or it was run with other parameters.
+	"""
+
+
+class CheckpointStore(object):
+	"""
+	Append-only store of finished cells, one JSON record per line with the
+	cell's key, arguments, seeds and result.
+	"""
+
+	def __init__(self, filename, resume = False):
+		"""
+		Opens the store. If resume, loads the cells already finished,
+		otherwise starts an empty file. Raises CheckpointError instead of
+		overwriting a file with records when resume is False.
+		"""
+
+		self.filename = filename
+		self.records = {}
+
+		if resume and os.path.exists(filename):
+			self.load()
+		elif os.path.exists(filename) and os.path.getsize(filename) > 0:
+			raise CheckpointError("checkpoint " + filename + " already has finished cells, resume it or remove it")
+		else:
+			open(filename, 'w').close()
+
+
+	def load(self):
+		"""
+		Loads the records. A truncated last line (the run died while writing
+		it) is discarded from the file.
+		"""
+
+		valid = 0
+		with open(self.filename, 'rb') as f:
+			for line in f:
+				try:
+					record = json.loads(line)
+				except ValueError:
+					break
+				self.records[tuple(record['key'])] = record
+				valid += len(line)
+
+		with open(self.filename, 'rb+') as f:
+			f.truncate(valid)
+
+
+	def seed(self):
+		"""
+		Returns the seed of the sweep that wrote the records (None if empty).
+		"""
+
+		for record in self.records.values():
+			return record['sweep']
+
+		return None
+
+
+	def done(self, key, arguments, seed):
+		"""
+		Is the cell already finished? Raises CheckpointError if it was run
+		with other arguments or seed.
+		"""
+
+		record = self.records.get(key)
+		if record == None:
+			return False
+
+		if record['arguments'] != json.loads(json.dumps(list(arguments), default = jsonDefault)) or record['seed'] != seed:
+			raise CheckpointError("cell " + str(key) + " in " + self.filename + " was run with other parameters")
+
+		return True
+
+
+	def result(self, key):
+		"""
+		Returns the stored result of a cell.
+		"""
+
+		return self.records[key]['result']
+
+
+	def append(self, key, arguments, seed, sweep_seed, result):
+		"""
+		Persists a finished cell.
+		"""
+
+		record = {'key': list(key), 'arguments': list(arguments), 'seed': seed, 'sweep': sweep_seed, 'result': result}
+		line = json.dumps(record, default = jsonDefault)
+		with open(self.filename, 'a') as f:
+			f.write(line + '\n')
+			f.flush()
+			os.fsync(f.fileno())
+		self.records[key] = json.loads(line)
+
+#******************************************************************************
+# SWEEP OPTIONS CLASS
+#******************************************************************************
+
+class SweepOptions(object):
+	"""
+	Options of the sweep of a density plot.
+
+	workers: number of worker processes to run the cells of the grid.
+	seed: seed of the whole grid, every cell derives its own from it (random if None).
+	checkpoint: file where every finished cell is persisted (None, no file unless resume).
+	resume: skips the cells already finished in checkpoint (named after the plot if None),
+	and reuses its seed if seed is None.
+	ci_width: if given, every cell stops sampling (in batches of batch instances) once the
+	confidence interval of its probability (ci_method, a key of INTERVALS) is at most this wide.
+	refine: levels of adaptive refinement of the grid (0, uniform grid), band the
+	probabilities of the blocks that are split.
+	common: every cell takes its instances from one pool of uniforms of the whole grid
+	(common random numbers), instead of its own draws.
+	"""
+
+	def __init__(self, workers = 1, seed = None, checkpoint = None, resume = False, ci_width = None, ci_method = 'wilson', batch = 50, refine = 0, band = (0.05, 0.95), common = False):
+		"""
+		Initializing.
+		"""
+
+		self.workers = workers
+		self.seed = seed
+		self.checkpoint = checkpoint
+		self.resume = resume
+		self.ci_width = ci_width
+		self.ci_method = ci_method
+		self.batch = batch
+		self.refine = refine
+		self.band = band
+		self.common = common
+
+
+def sweepOptions(args):
+	"""
+	Returns the SweepOptions of parsed arguments, the options missing in
+	args take their default values.
+	"""
+
+	options = SweepOptions()
+	for name in vars(options).keys():
+		if hasattr(args, name):
+			setattr(options, name, getattr(args, name))
+
+	return options
+
+
+def openCheckpoint(options, name):
+	"""
+	Opens the checkpoint of options (name + '.jsonl' if None and resuming,
+	no store if neither), and resolves the seed of the sweep: options' seed,
+	else the one stored (when resuming), else a random one, that is printed.
+	Raises CheckpointError if the stored seed is not options' seed.
+	Output: CheckpointStore (or None), seed
+	"""
+
+	store = None
+	seed = options.seed
+	if options.checkpoint != None or options.resume:
+		checkpoint = options.checkpoint
+		if checkpoint == None:
+			checkpoint = name + '.jsonl'
+		store = CheckpointStore(checkpoint, options.resume)
+		stored = store.seed()
+		if seed == None:
+			seed = stored
+		elif stored != None and stored != seed:
+			raise CheckpointError("checkpoint " + checkpoint + " was run with seed " + str(stored) + ", resume it with that seed or without --seed")
+	if seed == None:
+		seed = random.randrange(2**32)
+	print "Seed: ", seed
+
+	return store, seed
+
+#******************************************************************************
+# SEQUENTIAL STOPPING CLASS
+#******************************************************************************
+
+class SequentialExperiment(object):
+	"""
+	Wraps an experiment whose last argument is the number of trials and that
+	returns the number of afirmative instances. The trials of a cell are run
+	in batches, until the confidence interval of the probability is at most
+	width wide or the cell's trials are spent.
+	"""
+
+	def __init__(self, experiment, width, batch = 50, method = 'wilson', z = 1.96):
+		"""
+		Initializing. method is a key of DDLP_Random.INTERVALS, z the normal
+		quantile of the confidence (1.96 for 95%).
+		"""
+
+		self.experiment = experiment
+		self.width = width
+		self.batch = batch
+		self.interval = INTERVALS[method]
+		self.z = z
+
+
+	def __call__(self, *arguments, **options):
+		"""
+		Runs the cell. The batches share the generator, so the cell is as
+		reproducible as a single draw.
+		Output: [afirmative instances, trials run, lower, upper]
+		"""
+
+		arguments = list(arguments)
+		trials = arguments[-1]
+		successes = samples = 0
+		lower, upper = 0.0, 1.0
+		while samples < trials:
+			arguments[-1] = min(self.batch, trials - samples)
+			successes += self.experiment(*arguments, **options)
+			samples += arguments[-1]
+			lower, upper = self.interval(successes, samples, self.z)
+			if upper - lower <= self.width:
+				break
+
+		return [successes, samples, lower, upper]
+
+#******************************************************************************
+# SWEEP
+#******************************************************************************
+
+def sweep(experiment, cells, workers = 1, seed = 0, chunksize = 1, store = None, common = None):
+	"""
+	Runs experiment(*arguments, generator = generator) for every cell.
+
+	Input:
+
+	experiment: a module level function (it is sent to the workers by name),
+	or a SequentialExperiment wrapping one.
+	cells: list of (key, arguments), key is a tuple of integers identifying the cell.
+	workers: number of worker processes, 1 runs the cells in this process.
+	seed: the seed of the whole sweep.
+	chunksize: number of cells handed to a worker at a time.
+	store: a CheckpointStore, finished cells are skipped and new ones persisted.
+	common: shape (trials, n, 2) of a pool of uniforms drawn from seed, to be
+	shared by all the cells (common random numbers). None gives every cell
+	its own generator.
+
+	Output: dictionary {key: result}
+	"""
+
+	shared = None
+	if common != None:
+		shared = (seed, tuple(common))
+	tasks = []
+	arguments_of = {}
+	results = {}
+	for key, arguments in cells:
+		cell_seed = cellSeed(seed, key)
+		if store != None and store.done(key, arguments, cell_seed):
+			results[key] = store.result(key)
+		else:
+			tasks.append((key, experiment, arguments, cell_seed, shared))
+			arguments_of[key] = (arguments, cell_seed)
+
+	if len(results) > 0:
+		print "Resuming: ", len(results), " cells already done"
+	total = len(results) + len(tasks)
+
+	if workers > 1:
+		pool = Pool(workers)
+		try:
+			for key, result in pool.imap_unordered(runCell, tasks, chunksize):
+				results[key] = result
+				if store != None:
+					store.append(key, arguments_of[key][0], arguments_of[key][1], seed, result)
+				progress(len(results), total)
+		except:
+			pool.terminate()
+			raise
+		else:
+			pool.close()
+		pool.join()
+	else:
+		for task in tasks:
+			key, result = runCell(task)
+			results[key] = result
+			if store != None:
+				store.append(key, arguments_of[key][0], arguments_of[key][1], seed, result)
+			progress(len(results), total)
+
+	return results
+
+
+def refinedSweep(experiment, arguments, rows, cols, levels, side, workers = 1, seed = 0, chunksize = 1, store = None, common = None):
+	"""
+	Runs a rows x cols grid adaptively. The grid is split into blocks of
+	2^levels x 2^levels cells, and every block is represented by the cell at
+	its center. A block is split in four when its cell is in the band of
+	interest, or when a neighbouring block of the same size is on the other
+	side of the band, until blocks are single cells. The cells keep their
+	keys and seeds of the full grid, so results and checkpoints are shared
+	with a uniform sweep.
+
+	Input:
+
+	experiment, workers, seed, chunksize, store, common: as in sweep.
+	arguments: function of (i, j), the arguments of cell (i, j).
+	levels: number of times a block can be split.
+	side: function of a cell's result, -1 below the band, 0 in it, 1 above it.
+
+	Output: (dictionary {key: result} of the cells run, list of leaf blocks
+	(first row, last row + 1, first col, last col + 1, key of its cell))
+	"""
+
+	size = 2**levels
+	blocks = [(i, min(i + size, rows), j, min(j + size, cols)) for i in range(0, rows, size) for j in range(0, cols, size)]
+	results = {}
+	leaves = []
+
+	while len(blocks) > 0:
+		keys = {}
+		cells = []
+		for block in blocks:
+			key = ((block[0] + block[1])//2, (block[2] + block[3])//2)
+			keys[block] = key
+			if key not in results:
+				cells.append((key, arguments(*key)))
+		print "Blocks of size ", size, ": ", len(blocks), ", new cells: ", len(cells)
+		results.update(sweep(experiment, cells, workers, seed, chunksize, store, common))
+
+		sides = {}
+		for block in blocks:
+			sides[(block[0]//size, block[2]//size)] = side(results[keys[block]])
+
+		children = []
+		half = size//2
+		for block in blocks:
+			i, j = block[0]//size, block[2]//size
+			current = sides[(i, j)]
+			split = current == 0
+			for neighbour in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]:
+				if sides.get(neighbour, current) == -current:
+					split = True
+			if size > 1 and split:
+				for a, b in [(block[0], block[0] + half), (block[0] + half, block[1])]:
+					for c, d in [(block[2], block[2] + half), (block[2] + half, block[3])]:
+						if a < min(b, block[1]) and c < min(d, block[3]):
+							children.append((a, min(b, block[1]), c, min(d, block[3])))
+			else:
+				leaves.append(block + (keys[block],))
+		blocks = children
+		size = half
+
+	return results, leaves
@@ -19,6 +19,8 @@ Last update: January 4th 2019
 
 __author__ = 'Caleb Andrade'
 
+from array import array
+
 #******************************************************************************
 # HELPER FUNCTIONS
 #******************************************************************************
@@ -108,22 +110,40 @@ def dataTriangle(data, robots):
 class DataDelivery:
 	"""
 	Class to represent a DDLP instance.
+
+	Robots are referred to by their index. Positions and energies are kept
+	in contiguous arrays, and the energy consumption is tracked with a stamp
+	per robot: robot i has spent its energy iff stamp[i] == generation.
+	Every move is recorded in an undo log (trail).
 	"""
 
 	def __init__(self, robots, data = 0.0, energy = None):
 		""" 
 		Creates a DDLP instance.
-		Input: a list of robots (x_i, y_i), data position, energy consumption.
+		Input: a list of robots (x_i, y_i) or a NumPy (n, 2) array, data
+		position, energy consumption (a sequence of booleans, one per robot,
+		True if its energy is spent).
 		"""
 
-		self.robots = list(robots)
+		if hasattr(robots, 'shape'):
+			# NumPy array (e.g. a view of a batch), copied once so that moves use Python floats
+			self.positions = array('d', robots[:, 0].tolist())
+			self.energies = array('d', robots[:, 1].tolist())
+		else:
+			self.positions = array('d', [robot[0] for robot in robots])
+			self.energies = array('d', [robot[1] for robot in robots])
+		self.size = len(self.positions)
 		self.data_position = data
 		self.original_data = data
-		# the following dictionary is to keep track of energy consumption
-		if energy == None:
-			self.empty_energy = {robot:False for robot in self.robots}
-		else:
-			self.empty_energy = energy.copy()
+		# the following stamps are to keep track of energy consumption
+		self.generation = 1
+		self.stamp = array('l', [0]*self.size)
+		if energy != None:
+			for i in range(self.size):
+				if energy[i]:
+					self.stamp[i] = self.generation
+		# undo log of moves: (robot index, previous data position, was empty)
+		self.trail = []
 
 
 	def __str__(self):
@@ -132,43 +152,89 @@ class DataDelivery:
 		"""
 
 		string = ""
-		for i in range(len(self.robots)):
-			string += "\nRobot " + str(i) + ": " + str(self.robots[i]) + " Empty energy: " + str(self.empty_energy[self.robots[i]])
+		for i in range(self.size):
+			string += "\nRobot " + str(i) + ": " + str(self.robot(i)) + " Empty energy: " + str(self.isEmpty(i))
 		
 		return string
 
 	
+	def robot(self, i):
+		"""
+		Returns robot i as a tuple (x_i, y_i).
+		"""
+
+		return (self.positions[i], self.energies[i])
+
+
 	def robotsList(self):
 		"""
 		Returns list of robots.
 		"""
 
-		return list(self.robots)
+		return zip(self.positions.tolist(), self.energies.tolist())
+
+
+	def indexedRobots(self):
+		"""
+		Returns list of robots as tuples (x_i, y_i, i), so that robot[2]
+		is the index to be used with move.
+		"""
+
+		return zip(self.positions.tolist(), self.energies.tolist(), range(self.size))
+
+
+	def isEmpty(self, i):
+		"""
+		Has robot i spent its energy?
+		"""
+
+		return self.stamp[i] == self.generation
 
 	
-	def move(self, robot):
+	def move(self, i):
 		"""
-		Moves robot towards data and then to the farthest right.
+		Moves robot i towards data and then to the farthest right.
 		"""
 
 		# check if robot has enough energy to reach the data
-		distance = abs(self.data_position - robot[0])
-		if distance < robot[1] and not self.empty_energy[robot]:
-			real_energy = robot[1] - distance
-			self.data_position = self.data() + real_energy
-			self.empty_energy[robot] = True
+		position = self.positions[i]
+		energy = self.energies[i]
+		empty = self.stamp[i] == self.generation
+		self.trail.append((i, self.data_position, empty))
+		distance = abs(self.data_position - position)
+		if distance < energy and not empty:
+			real_energy = energy - distance
+			self.data_position = self.data_position + real_energy
+			self.stamp[i] = self.generation
 
 	
 	def moveRobots(self, certificate):
 		"""
-		Given a certificate of robots, move robots in such order.
+		Given a certificate of robot indices, move robots in such order.
 		"""
 
-		if len(certificate) > 0:
-			for robot in certificate:
-				self.move(robot)
-		else:
-			pass
+		for i in certificate:
+			self.move(i)
+
+
+	def undo(self):
+		"""
+		Undoes the last move.
+		"""
+
+		i, data, empty = self.trail.pop()
+		self.data_position = data
+		if not empty:
+			self.stamp[i] = 0
+
+
+	def rewind(self, mark):
+		"""
+		Undoes moves until the undo log has mark moves.
+		"""
+
+		while len(self.trail) > mark:
+			self.undo()
 
 
 	def data(self):
@@ -185,15 +251,197 @@ class DataDelivery:
 		"""
 
 		self.data_position = self.original_data
-		self.empty_energy = {robot:False for robot in self.robots}
+		self.generation += 1
+		self.trail = []
 
 
 	def copy(self):
 		"""
 		Returns a duplicate of this ddlp instance object.
 		"""
-		return DataDelivery(self.robots, data = self.data_position, energy = self.empty_energy)
+
+		duplicate = DataDelivery([], data = self.data_position)
+		duplicate.positions = self.positions
+		duplicate.energies = self.energies
+		duplicate.size = self.size
+		duplicate.generation = self.generation
+		duplicate.stamp = array('l', self.stamp)
+
+		return duplicate
 	
+#******************************************************************************
+# ACTIVE REGION CLASS
+#******************************************************************************
+
+class ActiveRegion(object):
+	"""
+	Incremental index of the active region of a DDLP instance.
+
+	Robots are kept in three orders: by x_i - rho_i (they become active), 
+	by x_i (they pass from the right to the left triangle) and by x_i + rho_i
+	(they become useless). As data advances, a pointer sweeps each order, 
+	so every robot enters and leaves the triangles once. Snapshots pushed
+	with push() are restored with pop(), for backtracking.
+
+	The bitmask key has the removed robots that are not useless yet: two
+	states with the same key and data position have the same future. The
+	energy left is the sum of rho_i of the robots neither removed nor useless.
+	"""
+
+	def __init__(self, ddlp_instance):
+		"""
+		Builds the index of the instance's robots at the instance's data position,
+		the robots that have spent their energy are removed.
+		"""
+
+		self.positions = ddlp_instance.positions.tolist()
+		self.energies = ddlp_instance.energies.tolist()
+		energies = self.energies
+		self.size = len(self.positions)
+		self.lower = [self.positions[i] - energies[i] for i in range(self.size)]
+		self.upper = [self.positions[i] + energies[i] for i in range(self.size)]
+		self.starts = sorted(range(self.size), key = lambda i: self.lower[i])
+		self.middles = sorted(range(self.size), key = lambda i: self.positions[i])
+		self.ends = sorted(range(self.size), key = lambda i: self.upper[i])
+		self.middle_rank = [0]*self.size
+		self.end_rank = [0]*self.size
+		self.start_rank = [0]*self.size
+		for rank in range(self.size):
+			self.start_rank[self.starts[rank]] = rank
+			self.middle_rank[self.middles[rank]] = rank
+			self.end_rank[self.ends[rank]] = rank
+		# pointers: robots starts[:head] are active, middles[:mid] are to the left of data, ends[:tail] are useless
+		self.head = self.mid = self.tail = 0
+		self.left = set()
+		self.right = set()
+		self.removed = bytearray(self.size)
+		self.log = []
+		self.stack = []
+		self.key = 0
+		self.energy = sum(energies)
+		self.data = float('-inf')
+		for i in range(self.size):
+			if ddlp_instance.isEmpty(i):
+				self.remove(i)
+		self.update(ddlp_instance.data())
+
+
+	def update(self, data):
+		"""
+		Advances data to a new position (it can only move to the right).
+		"""
+
+		size = self.size
+		self.data = data
+		while self.head < size and self.lower[self.starts[self.head]] < data:
+			i = self.starts[self.head]
+			self.head += 1
+			if not self.removed[i] and self.middle_rank[i] >= self.mid:
+				self.right.add(i)
+		while self.mid < size and self.positions[self.middles[self.mid]] <= data:
+			i = self.middles[self.mid]
+			self.mid += 1
+			if not self.removed[i]:
+				self.right.discard(i)
+				self.left.add(i)
+		while self.tail < size and self.upper[self.ends[self.tail]] <= data:
+			i = self.ends[self.tail]
+			self.tail += 1
+			if not self.removed[i]:
+				self.left.discard(i)
+				self.energy -= self.energies[i]
+			else:
+				self.key &= ~(1 << i)
+
+
+	def remove(self, i):
+		"""
+		Removes robot i (its energy has been spent).
+		"""
+
+		self.removed[i] = 1
+		self.left.discard(i)
+		self.right.discard(i)
+		self.log.append(i)
+		if self.end_rank[i] >= self.tail:
+			self.key |= 1 << i
+			self.energy -= self.energies[i]
+
+
+	def push(self):
+		"""
+		Saves a snapshot of the active region.
+		"""
+
+		self.stack.append((self.head, self.mid, self.tail, self.data, len(self.log), self.key, self.energy))
+
+
+	def pop(self):
+		"""
+		Restores the last snapshot saved with push().
+		"""
+
+		head, mid, tail, data, removals, key, energy = self.stack.pop()
+		while self.tail > tail:
+			self.tail -= 1
+			i = self.ends[self.tail]
+			if not self.removed[i]:
+				self.left.add(i)
+		while self.mid > mid:
+			self.mid -= 1
+			i = self.middles[self.mid]
+			if not self.removed[i]:
+				self.left.discard(i)
+				if self.start_rank[i] < self.head:
+					self.right.add(i)
+		while self.head > head:
+			self.head -= 1
+			i = self.starts[self.head]
+			if not self.removed[i]:
+				self.right.discard(i)
+		while len(self.log) > removals:
+			i = self.log.pop()
+			self.removed[i] = 0
+			if self.middle_rank[i] < self.mid:
+				if self.end_rank[i] >= self.tail:
+					self.left.add(i)
+			elif self.start_rank[i] < self.head:
+				self.right.add(i)
+		self.data = data
+		self.key = key
+		self.energy = energy
+
+
+	def reach(self):
+		"""
+		Returns the farthest position the data can reach: the largest x_i + rho_i
+		of the robots not removed (data itself if there is none to the right).
+		"""
+
+		rank = self.size - 1
+		while rank >= self.tail and self.removed[self.ends[rank]]:
+			rank -= 1
+		if rank < self.tail:
+			return self.data
+
+		return self.upper[self.ends[rank]]
+
+
+	def leftTriangle(self):
+		"""
+		Returns the robots in the left triangle, sorted by index.
+		"""
+
+		return sorted(self.left)
+
+
+	def rightTriangle(self):
+		"""
+		Returns the robots in the right triangle, sorted by index.
+		"""
+
+		return sorted(self.right)
+
 #******************************************************************************
 # TESTING
 #******************************************************************************
@@ -214,7 +462,7 @@ def main():
 	
 	for i in certificate:
 		print "\nRobot: ", robots[i]
-		ddlp_instance.move(robots[i])
+		ddlp_instance.move(i)
 		print "data's new position: ", ddlp_instance.data()
 
 	print "\nReset"
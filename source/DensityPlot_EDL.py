@@ -5,114 +5,23 @@ This code is a graphic visualization of the empirical probability of a
 randomly generated instance, with parameters (n,r), to be solvable.
 """
 
-from DataDelivery import dataTriangle, DataDelivery
-from DDLP_Random import randomRobotGenerator
+from DataDelivery import DataDelivery
+from DDLP_Backtrack import backtrack
+from DDLP_Bounds import EPSILON, reached
+from DDLP_Kernel import kernelize
+from DDLP_Random import randomRobotBatch, makeGenerator, uniforms, scaledBatch
+from DDLP_Sweep import sweep, refinedSweep, SequentialExperiment, SweepOptions, CheckpointError, sweepOptions, openCheckpoint
 from matplotlib import pyplot as plt
 import numpy as np
 import matplotlib.cm as cm
-from random import shuffle
 
 __author__ = 'Caleb Andrade'
 
-# Global variables
-NODES_EXPLORED = 0
-LIMIT = float('inf')
-
 #******************************************************************************
 # HELPER FUNCTIONS
 #******************************************************************************
 
-def leftTriangleStrategy(ddlp_instance, robots_available, robots_index):
-	"""
-	Returns a certificate with the left triangle strategy.
-	"""
-	certificate = []
-	data = ddlp_instance.data()
-	boolean = True
-	robots = list(robots_available)
-
-	while boolean:
-		# select robots in the triangle
-		left_triangle, right_triangle = dataTriangle(data, robots)
-		
-		
-		if len(left_triangle) > 0:
-			robot = left_triangle[0]
-		else:
-			boolean = False
-			break
-		
-		index = robots_index.index(robot)
-		certificate.append(index)
-		ddlp_instance.move(robot)
-		data = ddlp_instance.data()
-		robots.remove(robot)
-
-	return certificate, data, robots
-
-
-def recursiveDDLP(ddlp_instance, certificate, target, robots_available):
-	"""
-	Recursively applies DFS to build a certificate for ddlp instance.
-	"""
-
-	global LIMIT, NODES_EXPLORED
-
-	data = ddlp_instance.data()
-	robots_index = ddlp_instance.robotsList()
-	
-	# Node counting
-	NODES_EXPLORED += 1
-
-	# Check if number of NODES surpases the LIMIT
-	if NODES_EXPLORED > LIMIT:
-		return certificate
-	
-	# Check if target has been reached, output current certificate
-	if data >= target:
-		return certificate
-	
-	# Otherwise, continue searching
-	else:
-		# Check connected component
-		idx_robots_fijos, data_max, robots = leftTriangleStrategy(ddlp_instance, robots_available, robots_index)
-		certificate = certificate + idx_robots_fijos
-		if ddlp_instance.data() >= target:
-				return certificate
-		left_triangle, right_triangle = dataTriangle(data_max, robots)
-		shuffle(right_triangle)
-
-		# Explore children with recursion
-		for robot in right_triangle:
-			robots_copy = list(robots)
-			ddlp_instance.move(robot)
-			index = robots_index.index(robot)
-			certificate.append(index)
-			robots_copy.remove(robot)
-
-			certificate = recursiveDDLP(ddlp_instance, certificate, target, robots_copy)
-
-			if ddlp_instance.data() >= target:
-				return certificate
-
-			else:
-				# Undo changes in ddlp_instance
-				ddlp_instance.data_position = data_max
-				ddlp_instance.empty_energy[robot] = False
-				certificate.pop()
-
-		# Undo changes EDLA
-		for i in range(len(idx_robots_fijos)):
-			idx = certificate.pop()
-			ddlp_instance.empty_energy[robots_index[idx]] = False
-		
-		ddlp_instance.data_position = data
-
-		
-	return certificate
-
-
-def densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse = True, hyperbole = True):
+def densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse = True, hyperbole = True, options = None, critical = None, precision = None, check = False, nested = False):
 	"""
 	This function displays a density plot and saves it to a pdf file.
 	The density is an empirical probability.
@@ -129,24 +38,254 @@ def densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_r
 	trials: for each pair (n,r), trials refers to the number of random instances generated with (n,r)
 	reverse: interchanges white with black in the plot
 	hyperbole: displays the hyperbole r = 6/n
-	plot_name: to distinguish file naming.
+	plot_name: to distinguish file naming, the modes below append their own suffix.
+	options: SweepOptions of the grid (default options if None). With ci_width, trials is
+	the maximum per cell, and the trials run and the interval of every cell are saved with
+	z to a npz file. With refine, the grid starts with blocks of 2^refine x 2^refine cells,
+	and only the blocks whose probability is inside band (or next to a block across it) are
+	split, recursively. Every cell of a block takes the value of the cell at its center, so
+	the uniform z can still be plotted. The leaf blocks are saved with z to a npz file.
+	With common, the instances of every cell are scaled and cut to its n.
+	critical: a function certify(robots, source, target) that returns a certificate (empty if
+	there is none), monotone in the radius. If given, experiment is not used: every sample of
+	a column is solved by bisection on the radius (up to precision, by default a quarter of a
+	row) and every row is counted from the sorted critical radii, which are saved with z to a
+	npz file. check verifies the monotonicity at the rows' radii (debugging).
+	nested: with critical, every sample of a row grows robot by robot instead, and every
+	column is counted from the sorted critical numbers of robots.
+	The critical modes do not take the ci_width and refine options (ValueError).
 	"""
 
+	if options == None:
+		options = SweepOptions()
+	if critical != None and (options.ci_width != None or options.refine > 0):
+		raise ValueError("The critical modes do not take ci_width or refine")
+	workers = options.workers
+	ci_width = options.ci_width
+	band = options.band
 	robots_range = max_number_robots - min_number_robots
 	rows = cols = robots_range
 	source = epsilon
 	target = width - epsilon
 	z = np.empty((rows, cols))
 
-	for i in range(rows):
-		radius = min_radius + (i+1)*float(max_radius)/rows
-		print "********************************* number of robots ********************************************** ", i+1
-		for j in range(cols):
-			z[i][j] = experiment(source, target, width, radius, j + min_number_robots, trials)
+	radii = [min_radius + (i+1)*float(max_radius)/rows for i in range(rows)]
+	robot_counts = [j + min_number_robots for j in range(cols)]
+	if critical != None and nested:
+		plot_name += ' nested'
+		experiment = CriticalRobots(critical)
+	elif critical != None:
+		plot_name += ' critical'
+		if precision == None:
+			precision = float(max_radius)/rows/4
+		experiment = CriticalRadius(critical, min_radius, precision, check)
+	elif ci_width != None:
+		plot_name += ' ci=' + str(ci_width) + '_' + options.ci_method
+		experiment = SequentialExperiment(experiment, ci_width, options.batch, options.ci_method)
+	pool = None
+	if options.common:
+		plot_name += ' common'
+		pool = (trials, max_number_robots, 2)
+	# every mode has its own files (pdf, npz and checkpoint)
+	name = fileName(width, max_radius, max_number_robots, trials, rows, cols, plot_name)
+	store, seed = openCheckpoint(options, name)
+
+	def arguments(i, j):
+		return (source, target, width, radii[i], j + min_number_robots, trials)
+
+	def probability(result):
+		if ci_width == None:
+			return float(result)/trials
+		return float(result[0])/result[1]
+
+	def side(result):
+		if probability(result) <= band[0]:
+			return -1
+		if probability(result) >= band[1]:
+			return 1
+		return 0
+
+	if critical != None and nested:
+		cells = [((i,), (source, target, width, radii[i], robot_counts[0], robot_counts[-1], trials)) for i in range(rows)]
+		results = sweep(experiment, cells, workers, seed, store = store, common = pool)
+		counts_of = np.empty((rows, trials))
+		for (i,), critical_counts in results.items():
+			z[i, :] = np.searchsorted(critical_counts, robot_counts, side = 'right')
+			counts_of[i] = critical_counts
+		np.savez(name + '.npz', z = z, critical = counts_of)
+		plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse, hyperbole)
+		return
+
+	if critical != None:
+		cells = [((j,), (source, target, width, radii, j + min_number_robots, trials)) for j in range(cols)]
+		results = sweep(experiment, cells, workers, seed, store = store, common = pool)
+		radii_of = np.empty((cols, trials))
+		for (j,), critical_radii in results.items():
+			z[:, j] = np.searchsorted(critical_radii, radii, side = 'right')
+			radii_of[j] = critical_radii
+		np.savez(name + '.npz', z = z, critical = radii_of)
+		plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse, hyperbole)
+		return
+
+	if options.refine > 0:
+		results, leaves = refinedSweep(experiment, arguments, rows, cols, options.refine, side, workers, seed, store = store, common = pool)
+		print "Cells run: ", len(results), " of ", rows*cols
+	else:
+		cells = [((i, j), arguments(i, j)) for i in range(rows) for j in range(cols)]
+		results = sweep(experiment, cells, workers, seed, store = store, common = pool)
+		leaves = [(i, i + 1, j, j + 1, (i, j)) for (i, j) in results.keys()]
+
+	for a, b, c, d, key in leaves:
+		# scaled to trials, as the cells can have different number of samples
+		z[a:b, c:d] = probability(results[key])*trials
+
+	records = {}
+	if options.refine > 0:
+		records['leaves'] = np.array([leaf[:4] for leaf in leaves], int)
+	if ci_width != None:
+		samples = np.zeros((rows, cols), int)
+		interval = np.empty((rows, cols, 2))
+		for a, b, c, d, key in leaves:
+			interval[a:b, c:d] = results[key][2:]
+		for (i, j), result in results.items():
+			samples[i][j] = result[1]
+		print "Instances run: ", samples.sum(), " of ", rows*cols*trials
+		records['samples'] = samples
+		records['interval'] = interval
+	if len(records) > 0:
+		np.savez(name + '.npz', z = z, **records)
 
 	plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse, hyperbole)
 
 
+class CriticalRadius(object):
+	"""
+	Experiment of a whole column: the critical radius of every sample, the
+	smallest radius at which it is solvable. A sample is a fixed draw of
+	uniforms, scaled by width and radius, and adding energy never makes a
+	solvable instance unsolvable, so the critical radius is found by bisection.
+	"""
+
+	def __init__(self, certify, min_radius, precision, check = False):
+		"""
+		Initializing, certify is a function certify(robots, source, target).
+		"""
+
+		self.certify = certify
+		self.min_radius = min_radius
+		self.precision = precision
+		self.check = check
+
+
+	def __call__(self, source, target, width, radii, n, trials, generator = None):
+		"""
+		Bisection between min_radius and the largest of radii.
+		Output: sorted list of critical radii (inf if not solvable at the largest radius).
+		"""
+
+		if generator == None:
+			generator = makeGenerator()
+		units = uniforms(generator, (trials, n, 2))
+		critical_radii = []
+
+		for t in range(trials):
+			sample = units[t:t+1]
+			solvable = lambda radius: len(self.certify(scaledBatch(sample, width, radius)[0], source, target)) > 0
+			low, high = self.min_radius, max(radii)
+			if not solvable(high):
+				critical = float('inf')
+			elif solvable(low):
+				critical = low
+			else:
+				while high - low > self.precision:
+					middle = (low + high)/2
+					if solvable(middle):
+						high = middle
+					else:
+						low = middle
+				critical = high
+			if self.check:
+				for radius in radii:
+					# the bisection only brackets the critical radius up to precision
+					if (radius >= critical or radius <= critical - self.precision) and solvable(radius) != (radius >= critical):
+						raise ValueError("Sample " + str(t) + " with n = " + str(n) + " is not monotone at radius " + str(radius))
+			critical_radii.append(critical)
+
+		return sorted(critical_radii)
+
+
+class CriticalRobots(object):
+	"""
+	Experiment of a whole row: the critical number of robots of every sample,
+	the smallest n at which it is solvable. A sample is a stream of robots
+	and instance n + 1 appends one robot to instance n, so a solvable instance
+	stays solvable and the critical n is found by bisection on the prefixes.
+
+	The reach and energy bounds of every prefix come from running maxima and
+	sums, and skip the prefixes that cannot be solved. A certificate found
+	for a prefix only uses its first max(certificate) + 1 robots, so that
+	shorter prefix is known to be solvable without a search.
+	"""
+
+	def __init__(self, certify):
+		"""
+		Initializing, certify is a function certify(robots, source, target).
+		"""
+
+		self.certify = certify
+
+
+	def __call__(self, source, target, width, radius, min_n, max_n, trials, generator = None):
+		"""
+		Bisection between min_n and max_n robots.
+		Output: sorted list of critical numbers of robots (inf if max_n robots do not solve it).
+		"""
+
+		if generator == None:
+			generator = makeGenerator()
+		stream = uniforms(generator, (trials, max_n, 2))*np.array([width, radius])
+		# prefixes shorter than first are proved unsolvable by the bounds
+		reach = reached(np.maximum.accumulate(stream[:, :, 0] + stream[:, :, 1], axis = 1), target)
+		useful = stream[:, :, 0] + stream[:, :, 1] > source
+		energy = reached(source + np.cumsum(stream[:, :, 1]*useful, axis = 1)*(1 + EPSILON), target)
+		feasible = reach & energy
+		first = np.where(feasible.any(axis = 1), feasible.argmax(axis = 1) + 1, max_n + 1)
+		critical_counts = []
+
+		for t in range(trials):
+			robots = stream[t]
+			# low: largest prefix known to be unsolvable (or below min_n)
+			low = max(min_n, first[t]) - 1
+			if reached(source, target):
+				critical = min_n
+			elif low >= max_n:
+				critical = float('inf')
+			else:
+				high = max_n + 1
+				middle = max_n
+				while high - low > 1:
+					certificate = self.certify(robots[:middle], source, target)
+					if len(certificate) > 0:
+						high = max(min_n, max(certificate) + 1)
+					elif middle == max_n:
+						break
+					else:
+						low = middle
+					middle = (low + high)//2
+				critical = high if high <= max_n else float('inf')
+			critical_counts.append(critical)
+
+		return sorted(critical_counts)
+
+
+def fileName(width, max_radius, max_number_robots, trials, rows, cols, plot_name):
+	"""
+	Base name (without extension) of the files of a plot.
+	"""
+
+	return 'width='+str(width)+' max_radius='+str(max_radius)+' max_n='+str(max_number_robots)+' trials='+str(trials)+' rows='+str(rows)+' cols='+str(cols)+'_'+plot_name
+
+
 def plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse, hyperbole):
 	"""
 	Formatting plot.
@@ -178,10 +317,15 @@ def plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max
 	cbar.set_ticks([0, trials])
 	cbar.set_ticklabels(['0','1'])
 	plt.show()
-	f.savefig('width='+str(width)+' max_radius='+str(max_radius)+' max_n='+str(max_number_robots)+' trials='+str(trials)+' rows='+str(rows)+' cols='+str(cols)+'_'+plot_name+'.pdf', bbox_inches='tight')
+	f.savefig(fileName(width, max_radius, max_number_robots, trials, rows, cols, plot_name)+'.pdf', bbox_inches='tight')
 	
 
-def parseArgs():
+def argumentParser(extend = None):
+		"""
+		Returns the parser of the arguments of the density plot scripts,
+		extend(parser) adds the arguments of a single script.
+		"""
+
 		import argparse
 		parser = argparse.ArgumentParser()
 		parser.add_argument('infile1', help = 'width')
@@ -191,26 +335,63 @@ def parseArgs():
 		parser.add_argument('infile5', help = 'max_number_robots')
 		parser.add_argument('infile6', help = 'trials')
 		parser.add_argument('infile7', help = 'epsilon')
+		parser.add_argument('--workers', type = int, default = 1, help = 'number of worker processes')
+		parser.add_argument('--seed', type = int, default = None, help = 'seed of the whole grid')
+		parser.add_argument('--checkpoint', default = None, help = 'file where finished cells are persisted (none by default)')
+		parser.add_argument('--resume', action = 'store_true', help = 'skip the cells already finished in the checkpoint (named after the plot by default)')
+		parser.add_argument('--ci-width', type = float, default = None, help = 'stop a cell once its confidence interval is this wide')
+		parser.add_argument('--ci-method', default = 'wilson', choices = ['wilson', 'clopper-pearson'], help = 'confidence interval of the sequential stopping')
+		parser.add_argument('--batch', type = int, default = 50, help = 'instances drawn at a time with sequential stopping')
+		parser.add_argument('--refine', type = int, default = 0, help = 'levels of adaptive refinement of the grid')
+		parser.add_argument('--band', type = float, nargs = 2, default = [0.05, 0.95], help = 'probabilities of the band that is refined')
+		parser.add_argument('--common', action = 'store_true', help = 'share one pool of uniforms among all the cells')
+		if extend != None:
+			extend(parser)
 		
-		return parser.parse_args()
+		return parser
+
+
+def criticalArguments(parser):
+	"""
+	Adds the arguments of the critical modes (DensityPlot_EDL.py and
+	DensityPlot_EDLA.py) to parser.
+	"""
+
+	parser.add_argument('--critical', action = 'store_true', help = 'bisect the critical radius of every sample')
+	parser.add_argument('--precision', type = float, default = None, help = 'precision of the critical radius')
+	parser.add_argument('--check', action = 'store_true', help = 'verify the monotonicity in the radius of every sample')
+	parser.add_argument('--nested', action = 'store_true', help = 'grow every sample robot by robot to find its critical number of robots')
+
+
+def checkCritical(parser, args):
+	"""
+	Rejects the arguments that the critical modes would ignore.
+	"""
+
+	if args.critical and args.nested:
+		parser.error("--critical and --nested are exclusive")
+	if (args.precision != None or args.check) and not args.critical:
+		parser.error("--precision and --check need --critical")
+	if (args.critical or args.nested) and (args.ci_width != None or args.refine > 0):
+		parser.error("--critical and --nested do not take --ci-width or --refine")
 
 #******************************************************************************
 # SIMULATION
 #******************************************************************************
 
-def experiment(source, target, width, radius, n, trials):
+def experiment(source, target, width, radius, n, trials, generator = None):
 	"""
 	Experiment
 	"""
 	yes_instances = 0
 
+	if generator == None:
+		generator = makeGenerator()
+	batch = randomRobotBatch(width, radius, n, trials, generator)
+
 	for i in range(trials):
 
-		robots = randomRobotGenerator(width, radius, n)
-		ddlp_instance = DataDelivery(robots, data = source)
-		global NODES_EXPLORED
-		NODES_EXPLORED = 0
-		certificate = recursiveDDLP(ddlp_instance, [], target, robots)
+		certificate = certify(batch[i], source, target)
 
 		if len(certificate) > 0:
 			yes_instances += 1
@@ -218,12 +399,31 @@ def experiment(source, target, width, radius, n, trials):
 	return yes_instances
 
 
+def certify(robots, source, target):
+	"""
+	Returns a certificate of the instance (Backtrack on its kernel), empty if there is none.
+	"""
+
+	kernel = kernelize(robots, source, target)
+	if reached(kernel.source, target):
+		# solved by the left closure (empty if source already reached target)
+		return kernel.prefix
+
+	certificate, stats = backtrack(DataDelivery(kernel.robots, data = kernel.source), target)
+	if len(certificate) == 0:
+		return []
+
+	return kernel.certificate(certificate)
+
+
 def main():
 	"""
 	Main method.
 	"""
 
-	args = parseArgs()    
+	parser = argumentParser(criticalArguments)
+	args = parser.parse_args()
+	checkCritical(parser, args)
 	width = float(args.infile1)
 	min_radius = float(args.infile2)
 	max_radius = float(args.infile3)
@@ -232,7 +432,10 @@ def main():
 	trials = int(args.infile6)
 	epsilon = float(args.infile7)
 
-	densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, 'EDL')
+	try:
+		densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, 'EDL', options = sweepOptions(args), critical = certify if args.critical or args.nested else None, precision = args.precision, check = args.check, nested = args.nested)
+	except CheckpointError as error:
+		parser.error(str(error))
 
 	
 if __name__ == '__main__':	
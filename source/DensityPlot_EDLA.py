@@ -3,11 +3,18 @@ DATA DELIVERY BY ENERGY CONSTRAINED MOBILE AGENTS ON A LINE PROBLEM (EDLA)
 
 This code is a graphic visualization of the empirical probability of a
 randomly generated instance, with parameters (n,r), to be solvable.
+
+In FDDLP robots only carry the data forward: a robot at x_i <= d moves it
+to x_i + rho_i. Sorted by x_i, the data reaches the prefix maximum of
+x_i + rho_i until the first robot to the right of it, so solving takes a
+sort and a sweep.
 """
 
-from DataDelivery import dataTriangle, DataDelivery
-from DDLP_Random import randomRobotGenerator
-from DensityPlot_EDL import densityPlot, parseArgs
+import heapq
+from DataDelivery import DataDelivery
+from DDLP_Random import randomRobotBatch, makeGenerator
+from DDLP_Sweep import CheckpointError, sweepOptions
+from DensityPlot_EDL import densityPlot, argumentParser, criticalArguments, checkCritical
 from matplotlib import pyplot as plt
 import numpy as np
 import matplotlib.cm as cm
@@ -18,58 +25,86 @@ __author__ = 'Caleb Andrade'
 # HELPER FUNCTIONS
 #******************************************************************************
 
-def polinomialEDLA(ddlp_instance, robots_available, target):
+def polinomialEDLA(ddlp_instance, target):
 	"""
-	Returns a certificate with the left triangle strategy.
+	Returns a certificate with the left triangle strategy: the robot of
+	smallest index in the left triangle moves first. Robots enter a heap
+	(by index) once the data passes them, and the useless ones are dropped
+	when popped, so every robot is processed once, O(n log n).
+	The instance is not modified.
 	"""
 	certificate = []
 	data = ddlp_instance.data()
-	boolean = True
-	robots_index = ddlp_instance.robotsList()
-	robots = list(robots_available)
-
-	while boolean:
-		# select robots in the triangle
-		left_triangle, right_triangle = dataTriangle(data, robots)
-		
-		
-		if len(left_triangle) > 0:
-			robot = left_triangle[0]
-		else:
-			boolean = False
+	positions = ddlp_instance.positions.tolist()
+	energies = ddlp_instance.energies.tolist()
+	order = sorted(range(ddlp_instance.size), key = lambda i: positions[i])
+	heap = []
+	k = 0
+
+	while True:
+		# robots passed by the data
+		while k < len(order) and positions[order[k]] <= data:
+			heapq.heappush(heap, order[k])
+			k += 1
+		# select the first robot of the left triangle
+		while len(heap) > 0 and positions[heap[0]] + energies[heap[0]] <= data:
+			heapq.heappop(heap)
+		if len(heap) == 0:
 			break
-		
-		index = robots_index.index(robot)
-		certificate.append(index)
-		ddlp_instance.move(robot)
-		data = ddlp_instance.data()
-		robots.remove(robot)
-
-	if ddlp_instance.data() < target:
+		robot = heapq.heappop(heap)
+		certificate.append(robot)
+		data = positions[robot] + energies[robot]
+
+	if data < target:
 		certificate = []
 
 	return certificate
 
+
+def batchEDLA(batch, source, target):
+	"""
+	Solves every instance of a (trials, n, 2) batch. Sorted by x_i, robot j
+	is reached iff x_j <= the prefix maximum of x_i + rho_i (and source) of
+	the robots before it, and the data ends at that prefix maximum before
+	the first robot not reached.
+	Output: boolean array of shape (trials,), is the instance solvable?
+	"""
+
+	trials, n = batch.shape[0], batch.shape[1]
+	order = np.argsort(batch[:, :, 0], axis = 1, kind = 'mergesort')
+	x = np.take_along_axis(batch[:, :, 0], order, axis = 1)
+	reach = np.take_along_axis(batch[:, :, 0] + batch[:, :, 1], order, axis = 1)
+	# farthest data before robot j: source and robots 0..j-1
+	before = np.maximum.accumulate(np.concatenate((np.full((trials, 1), float(source)), reach), axis = 1), axis = 1)
+	blocked = np.concatenate((x > before[:, :-1], np.ones((trials, 1), bool)), axis = 1)
+	first = np.argmax(blocked, axis = 1)
+	data = before[np.arange(trials), first]
+
+	return data >= target
+
 #******************************************************************************
 # SIMULATION
 #******************************************************************************
 	
-def experiment(source, target, width, radius, n, trials):
+def experiment(source, target, width, radius, n, trials, generator = None):
 	"""
 	Experiment
 	"""
-	yes_instances = 0
 
-	for i in range(trials):
+	if generator == None:
+		generator = makeGenerator()
+	batch = randomRobotBatch(width, radius, n, trials, generator)
+	yes_instances = np.count_nonzero(batchEDLA(batch, source, target))
+			
+	return int(yes_instances)
 
-		robots = randomRobotGenerator(width, radius, n)
-		ddlp_instance = DataDelivery(robots, data = source)
-		certificate = polinomialEDLA(ddlp_instance, robots, target)
 
-		if len(certificate) > 0:
-			yes_instances += 1
-			
-	return yes_instances
+def certify(robots, source, target):
+	"""
+	Returns a certificate of the instance (left triangle strategy), empty if there is none.
+	"""
+
+	return polinomialEDLA(DataDelivery(robots, data = source), target)
 
 
 def main():
@@ -77,7 +112,9 @@ def main():
 	Main method.
 	"""
 
-	args = parseArgs()    
+	parser = argumentParser(criticalArguments)
+	args = parser.parse_args()
+	checkCritical(parser, args)
 	width = float(args.infile1)
 	min_radius = float(args.infile2)
 	max_radius = float(args.infile3)
@@ -86,7 +123,10 @@ def main():
 	trials = int(args.infile6)
 	epsilon = float(args.infile7)
 
-	densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, 'EDLA')
+	try:
+		densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, 'EDLA', options = sweepOptions(args), critical = certify if args.critical or args.nested else None, precision = args.precision, check = args.check, nested = args.nested)
+	except CheckpointError as error:
+		parser.error(str(error))
 
 	
 if __name__ == '__main__':	
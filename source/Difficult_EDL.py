@@ -3,20 +3,27 @@ DATA DELIVERY BY ENERGY CONSTRAINED MOBILE AGENTS ON A LINE PROBLEM
 (Difficult instances)
 
 This code is a graphic visualization of the empirical probability of a
-randomly generated instance, with parameters (n,r), to be solved by ten
-different approximation algorithms and backtrack on instances presumably
-difficult.
+randomly generated instance, with parameters (n,r), to be solved by
+fourteen different approximation algorithms (the reverse heuristics, the
+greedy heuristics and the pair strategies) and backtrack on instances
+presumably difficult.
+
+Every instance goes through a cascade of stages: the bounds prove NO
+instances, a valid certificate from any heuristic proves a YES instance,
+and backtrack only runs on the instances still undecided. Every heuristic
+is compared with the answer, whichever stage found it.
 """
 
-from DataDelivery import DataDelivery
-from DDLP_Random import randomRobotGenerator
-from DensityPlot_EDL import plotLayout, parseArgs, recursiveDDLP
-from DDLP_ReverseHeuristic import reverseHeuristic
-from DDLP_Heuristic import greedyHeuristic
+from DataDelivery import DataDelivery, objectiveValue
+from DDLP_Random import randomRobotBatch, makeGenerator
+from DDLP_Sweep import sweep, SweepOptions, CheckpointError, sweepOptions, openCheckpoint
+from DensityPlot_EDL import plotLayout, argumentParser, fileName, certify
+from DDLP_Bounds import infeasibilityReason, reached
+from DDLP_ReverseHeuristic import reverseHeuristic, REVERSE_KEYS
+from DDLP_Heuristic import greedyHeuristic, RIGHT_KEYS, PAIR_STRATEGIES
 from matplotlib import pyplot as plt
 import numpy as np
 import matplotlib.cm as cm
-from random import shuffle
 from math import log
 
 __author__ = 'Caleb Andrade'
@@ -25,11 +32,15 @@ __author__ = 'Caleb Andrade'
 YES_INSTANCES = 0
 NO_INSTANCES = 0
 
+# Stages of the cascade, in order: 'bounds', the heuristics and 'backtrack'
+# (--pipeline in the command line)
+PIPELINE = ['bounds', "max_x", "min_x", "max_s", "min_s", "hlr", 'closest_robot', 'lowest_reach', 'highest_capacity', 'less_capacity', 'random_sampling', 'best_robot', 'pair_heuristic', 'brute_pair', 'quotient', 'backtrack']
+
 #******************************************************************************
 # HELPER FUNCTIONS
 #******************************************************************************
 
-def  densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, plot_name, reverse = True, hyperbole = True, difficult = True):
+def  densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, plot_name, reverse = True, hyperbole = True, difficult = True, options = None):
 	"""
 	This function displays a density plot and saves it to a pdf file.
 	The density is an empirical probability.
@@ -46,8 +57,13 @@ def  densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_
 	reverse: interchanges white with black in the plot
 	hyperbole: displays the hyperbole r = 6/n
 	plot_name: to distinguish file naming.
+	options: SweepOptions of the grid (default options if None), sequential stopping and
+	refinement do not apply. With common, the instance of every cell is scaled and cut to its n.
 	"""
 
+	global YES_INSTANCES
+	global NO_INSTANCES
+
 	robots_range = max_number_robots - min_number_robots
 	rows = cols = robots_range
 	source = epsilon
@@ -55,15 +71,24 @@ def  densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_
 
 	z = np.zeros((rows, cols), int)
 
-	hamming_distance = {"max_x":0, "min_x":0, "max_s":0, "min_s":0, "hlr":0,'closest_robot':0, 'lowest_reach':0, 'highest_capacity':0, 'less_capacity':0, 'random_sampling':0}
-
-
+	heuristics = getattr(experiment, "heuristics", Cascade().heuristics)
+	# the value of a cell is the number of heuristics that fail, at most len(heuristics)
+	scale = len(heuristics)
+	hamming_distance = dict([(heuristic_type, 0) for heuristic_type in heuristics])
+	decided = {}
+
+	if options == None:
+		options = SweepOptions()
+	pool = None
+	if options.common:
+		plot_name += ' common'
+		pool = (1, max_number_robots, 2)
+	store, seed = openCheckpoint(options, fileName(width, max_radius, max_number_robots, scale, rows, cols, plot_name))
+
+	cells = []
 	for i in range(rows):
 		radius = min_radius + (i+1)*float(max_radius)/rows
-		print "********************************* number of robots ********************************************** ", i+1
 		for j in range(cols):
-			global YES_INSTANCES
-			global NO_INSTANCES
 			n = j + min_number_robots
 
 			# Difficult instances or not?
@@ -71,79 +96,153 @@ def  densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_
 				if radius < log(n)/n or 2*log(n)/n < radius:
 					continue
 
-			temp_vector = experiment(source, target, width, radius, n)
-			z[i][j] = sum(temp_vector)
-			k = 0
-			for heuristic_type in ["max_x", "min_x", "max_s", "min_s", "hlr",'closest_robot', 'lowest_reach', 'highest_capacity', 'less_capacity', 'random_sampling']:
-				hamming_distance[heuristic_type] = hamming_distance[heuristic_type] + temp_vector[k]
-				k = k + 1
+			cells.append(((i, j), (source, target, width, radius, n)))
+
+	results = sweep(experiment, cells, options.workers, seed, store = store, common = pool)
+
+	for (i, j), result in results.items():
+		temp_vector, yes_instance = result[0], result[1]
+		# checkpoints written before the cascade have no stage
+		stage = 'backtrack'
+		if len(result) > 2:
+			stage = result[2]
+		z[i][j] = sum(temp_vector)
+		decided[stage] = decided.get(stage, 0) + 1
+		if yes_instance:
+			YES_INSTANCES = YES_INSTANCES + 1
+		else:
+			NO_INSTANCES = NO_INSTANCES + 1
+		k = 0
+		for heuristic_type in heuristics:
+			hamming_distance[heuristic_type] = hamming_distance[heuristic_type] + temp_vector[k]
+			k = k + 1
 
 	print "\nApproximation Ratio: "
-	for heuristic_type in hamming_distance.keys():
+	for heuristic_type in heuristics:
 		distance = hamming_distance[heuristic_type]
 		ratio = 100*(1-(float(distance)/YES_INSTANCES))
 		print heuristic_type, ': ', round(ratio,2), '%'
 
 	print "\nYES_INSTANCES: ", YES_INSTANCES
 	print "NO_INSTANCES: ", NO_INSTANCES
+	print "Decided by: ", decided
+
+	plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, scale, plot_name, reverse, hyperbole)
+
+
+def stages():
+	"""
+	Returns the names of all the stages of a pipeline.
+	"""
 
-	plotLayout(z, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, 10, plot_name, reverse, hyperbole)
+	return ['bounds'] + sorted(REVERSE_KEYS.keys()) + sorted(RIGHT_KEYS.keys()) + ['random_sampling'] + sorted(PAIR_STRATEGIES.keys()) + ['backtrack']
 
 
-def xOR(certificate_1, certificate_2):
+def solves(ddlp_instance, certificate, target):
 	"""
-	An xOR for two certificates.
+	Does the certificate move the data to target? (up to EPSILON, as backtrack)
 	"""
 
-	if len(certificate_1) > 0 and len(certificate_2) == 0:
-		return 1
+	if len(certificate) == 0:
+		return False
 
-	if len(certificate_2) > 0 and len(certificate_1) == 0:
-		return 1
+	return reached(objectiveValue(ddlp_instance, certificate), target)
 
-	return 0
+#******************************************************************************
+# CASCADE CLASS
+#******************************************************************************
+
+class Cascade(object):
+	"""
+	Experiment that decides an instance with the stages of a pipeline, in
+	order. 'bounds' proves NO instances (and then no heuristic can solve it),
+	a heuristic proves YES instances with a valid certificate, 'backtrack'
+	decides the instances still undecided. After the answer is known only the
+	remaining heuristics run, to be compared with it.
+	"""
+
+	def __init__(self, pipeline = PIPELINE):
+		"""
+		Initializing, pipeline is a list of stages (see stages()), it must
+		have 'backtrack' to decide every instance.
+		"""
+
+		for stage in pipeline:
+			if stage not in stages():
+				raise ValueError("Unknown stage: " + str(stage))
+		if 'backtrack' not in pipeline:
+			raise ValueError("The pipeline must have the stage 'backtrack'")
+		self.pipeline = list(pipeline)
+		self.heuristics = [stage for stage in self.pipeline if stage not in ['bounds', 'backtrack']]
+
+
+	def heuristic(self, heuristic_type, ddlp_instance, source, target):
+		"""
+		Runs a heuristic. Output: did it find a valid certificate?
+		"""
+
+		if heuristic_type in REVERSE_KEYS:
+			certificate, targets = reverseHeuristic(ddlp_instance.robotsList(), heuristic_type, source, target)
+		else:
+			certificate, data = greedyHeuristic(ddlp_instance, heuristic_type)
+
+		return solves(ddlp_instance, certificate, target)
+
+
+	def __call__(self, source, target, width, radius, n, generator = None):
+		"""
+		Experiment
+		Output: hamming distances of the heuristics to the answer, whether 
+		the instance is solvable, and the stage that decided it.
+		"""
+
+		if generator == None:
+			generator = makeGenerator()
+		robots = randomRobotBatch(width, radius, n, 1, generator)[0]
+		ddlp_instance = DataDelivery(robots, data = source)
+		yes_instance = None # unknown
+		stage = None
+		found = {}
+
+		for current in self.pipeline:
+			if current == 'bounds':
+				if yes_instance == None and infeasibilityReason(ddlp_instance.robotsList(), source, target) != None:
+					yes_instance = False
+					stage = current
+			elif current == 'backtrack':
+				if yes_instance == None:
+					certificate = certify(robots, source, target)
+					yes_instance = len(certificate) > 0
+					stage = current
+			elif yes_instance == False:
+				# heuristics only return valid certificates
+				found[current] = False
+			else:
+				found[current] = self.heuristic(current, ddlp_instance, source, target)
+				if found[current] and yes_instance == None:
+					yes_instance = True
+					stage = current
+
+		if yes_instance == None:
+			raise ValueError("The pipeline " + str(self.pipeline) + " did not decide the instance")
+
+		# hamming distance between Aproximation Algorithms and the answer
+		hamming_distance = [int(found[heuristic_type] != yes_instance) for heuristic_type in self.heuristics]
+
+		return hamming_distance, yes_instance, stage
 
 #******************************************************************************
 # SIMULATION
 #******************************************************************************
 
-def experiment(source, target, width, radius, n):
+def experiment(source, target, width, radius, n, generator = None):
 	"""
-	Experiment
+	Experiment with the default pipeline.
+	Output: hamming distances of the heuristics to backtrack, whether 
+	the instance is solvable, and the stage that decided it.
 	"""
 
-	global YES_INSTANCES
-	global NO_INSTANCES
-		
-	# hamming distance between Aproximation Algorithms and Backtrack
-	hamming_distance = [0 for i in range(10)]
-
-	i = 0
-
-	robots = randomRobotGenerator(width, radius, n)
-	robots_1 = list(robots)
-	robots_2 = list(robots)
-	ddlp_instance_1 =  DataDelivery(robots_1, data = source)
-	ddlp_instance_2 =  DataDelivery(robots_2, data = source)
-	certificate_1 = recursiveDDLP(ddlp_instance_1, [], target, robots_1)
-	if len(certificate_1) > 0:
-		YES_INSTANCES = YES_INSTANCES + 1
-	else:
-		NO_INSTANCES = NO_INSTANCES + 1
-	
-	for heuristic_type in ["max_x", "min_x", "max_s", "min_s", "hlr"]:
-		certificate_2, targets = reverseHeuristic(robots_2, heuristic_type, source, target)
-		hamming_distance[i] = xOR(certificate_1, certificate_2)
-		i = i + 1
-		
-	for heuristic_type in ['closest_robot', 'lowest_reach', 'highest_capacity', 'less_capacity', 'random_sampling']:
-		certificate_2, data =  greedyHeuristic(ddlp_instance_2, heuristic_type)
-		if data < target:
-			certificate_2 = []
-		hamming_distance[i] = xOR(certificate_1, certificate_2)
-		i = i + 1
-	
-	return hamming_distance
+	return Cascade()(source, target, width, radius, n, generator)
 
 
 def main():
@@ -151,7 +250,8 @@ def main():
 	Main method.
 	"""
 
-	args = parseArgs()    
+	parser = argumentParser(lambda parser: parser.add_argument('--pipeline', nargs = '+', default = PIPELINE, choices = stages(), help = 'stages of the cascade, in order'))
+	args = parser.parse_args()
 	width = float(args.infile1)
 	min_radius = float(args.infile2)
 	max_radius = float(args.infile3)
@@ -160,8 +260,14 @@ def main():
 	trials = int(args.infile6)
 	epsilon = float(args.infile7)
 	difficult = True
-
-	densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, 'Difficult'+str(difficult), False, True, difficult)
+	plot_name = 'Difficult'+str(difficult)
+	if args.pipeline != PIPELINE:
+		plot_name += ' ' + ' '.join(args.pipeline)
+
+	try:
+		densityPlot(Cascade(args.pipeline), width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, plot_name, False, True, difficult, options = sweepOptions(args))
+	except CheckpointError as error:
+		parser.error(str(error))
 
 	
 if __name__ == '__main__':	
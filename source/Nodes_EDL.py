@@ -4,115 +4,105 @@ DATA DELIVERY BY ENERGY CONSTRAINED MOBILE AGENTS ON A LINE PROBLEM (Node Counti
 This code is a graphic visualization of the empirical probability of a
 randomly generated instance, with parameters (n,r), to have a large number of nodes
 to be explored by the Backtrack algorithm.
+
+With restarts, the same node limit is a global budget shared by attempts
+of a Luby or geometric schedule, and the plot shows the probability of
+an instance to remain undecided within the budget. The children of the
+search can be explored in any order of DDLP_Backtrack.ORDERS.
 """
 
-from DataDelivery import DataDelivery, dataTriangle
-from DDLP_Random import randomRobotGenerator
-from DensityPlot_EDL import leftTriangleStrategy, parseArgs, densityPlot
+from DataDelivery import DataDelivery
+from DDLP_Backtrack import backtrack, restartBacktrack, SCHEDULES, UNIT, ORDERS
+from DDLP_Random import randomRobotBatch, makeGenerator
+from DDLP_Sweep import CheckpointError, sweepOptions
+from DensityPlot_EDL import argumentParser, densityPlot
 from matplotlib import pyplot as plt
 import numpy as np
 import matplotlib.cm as cm
-from random import shuffle
 from math import log
 
 __author__ = 'Caleb Andrade'
 
-# Global variables
-NODES_EXPLORED = 0
-
 #******************************************************************************
 # HELPER FUNCTIONS
 #******************************************************************************
 
-def recursiveDDLP(ddlp_instance, certificate, target, robots_available, limit):
+def nodeBudget(width, radius):
 	"""
-	Recursively applies DFS to build a certificate for ddlp instance.
+	Number of nodes beyond which an instance counts as large, log(100)*3*width/radius rounded.
 	"""
 
-	data = ddlp_instance.data()
-	robots_index = ddlp_instance.robotsList()
-	
-	# Node counting
-	global NODES_EXPLORED
-	NODES_EXPLORED += 1
+	return int(round(log(100)*(3.0*width)/radius))
 
-	# Check if number of NODES surpases the limit
-	if NODES_EXPLORED > limit:
-		return certificate
-	
-	# Check if target has been reached, output current certificate
-	if data >= target:
-		return certificate
-	
-	# Otherwise, continue searching
-	else:
-		# Check connected component
-		idx_robots_fijos, data_max, robots = leftTriangleStrategy(ddlp_instance, robots_available, robots_index)
-		certificate = certificate + idx_robots_fijos
-		if ddlp_instance.data() >= target:
-				return certificate
-		left_triangle, right_triangle = dataTriangle(data_max, robots)
-		shuffle(right_triangle)
-
-		# Explore children with recursion
-		for robot in right_triangle:
-			robots_copy = list(robots)
-			ddlp_instance.move(robot)
-			index = robots_index.index(robot)
-			certificate.append(index)
-			robots_copy.remove(robot)
-
-			certificate = recursiveDDLP(ddlp_instance, certificate, target, robots_copy, limit)
-
-			if ddlp_instance.data() >= target:
-				return certificate
-
-			else:
-				# Undo changes in ddlp_instance
-				ddlp_instance.data_position = data_max
-				ddlp_instance.empty_energy[robot] = False
-				certificate.pop()
 
-		# Undo changes EDLA
-		for i in range(len(idx_robots_fijos)):
-			idx = certificate.pop()
-			ddlp_instance.empty_energy[robots_index[idx]] = False
-		
-		ddlp_instance.data_position = data
+def nodeArguments(parser):
+	"""
+	Adds the arguments of Nodes_EDL to the parser of the density plot scripts.
+	"""
 
-		
-	return certificate
+	parser.add_argument('--restarts', default = None, choices = sorted(SCHEDULES.keys()), help = 'restart schedule of the backtrack')
+	parser.add_argument('--unit', type = int, default = UNIT, help = 'nodes of the shortest attempt with restarts')
+	parser.add_argument('--order', default = 'random', choices = sorted(ORDERS.keys()), help = 'order of the children of the backtrack')
 
 #******************************************************************************
-# SIMULATION
+# NODE EXPERIMENT CLASS
 #******************************************************************************
 
-def experiment(source, target, width, radius, n, trials):
+class NodeExperiment(object):
 	"""
-	Experiment
+	Experiment with an order of the children and, if schedule is not None,
+	restarts: the node limit is then the budget of restartBacktrack, and
+	the instances undecided within the budget are counted.
 	"""
-	yes_instances = 0
-	limit = (log(100))*(3.0*width)/radius
-
-	for i in range(trials):
-
-		robots = randomRobotGenerator(width, radius, n)
-		ddlp_instance = DataDelivery(robots, data = source)
-		global NODES_EXPLORED
-		NODES_EXPLORED = 0
-		certificate = recursiveDDLP(ddlp_instance, [], target, robots, limit)
-		if NODES_EXPLORED > limit:
-			yes_instances += 1
-			
-	return yes_instances
-	
+
+	def __init__(self, order = 'random', schedule = None, unit = UNIT):
+		"""
+		Initializing.
+		"""
+
+		self.order = order
+		self.schedule = schedule
+		self.unit = unit
+
+
+	def __call__(self, source, target, width, radius, n, trials, generator = None):
+		"""
+		Experiment
+		"""
+		yes_instances = 0
+		budget = nodeBudget(width, radius)
+
+		if generator == None:
+			generator = makeGenerator()
+		batch = randomRobotBatch(width, radius, n, trials, generator)
+
+		for i in range(trials):
+
+			ddlp_instance = DataDelivery(batch[i], data = source)
+			if self.schedule == None:
+				certificate, stats = backtrack(ddlp_instance, target, budget, order = self.order)
+			else:
+				certificate, stats = restartBacktrack(ddlp_instance, target, budget, self.schedule, self.unit, order = self.order)
+			if stats.limit_reached:
+				yes_instances += 1
+
+		return yes_instances
+
+#******************************************************************************
+# SIMULATION
+#******************************************************************************
+
+# random order without restarts, the experiment of the original plot
+experiment = NodeExperiment()
+
 
 def main():
 	"""
 	Main method.
 	"""
 
-	args = parseArgs()    
+	parser = argumentParser(nodeArguments)
+	args = parser.parse_args()
 	width = float(args.infile1)
 	min_radius = float(args.infile2)
 	max_radius = float(args.infile3)
@@ -121,8 +111,18 @@ def main():
 	trials = int(args.infile6)
 	epsilon = float(args.infile7)
 
-	densityPlot(experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, 'Conteo de Nodos', reverse = False, hyperbole = False)
+	plot_name = 'Conteo de Nodos'
+	if args.restarts != None or args.order != 'random':
+		plot_name = plot_name + ' ' + args.order
+		if args.restarts != None:
+			plot_name = plot_name + ' ' + args.restarts
+	cell_experiment = NodeExperiment(args.order, args.restarts, args.unit)
+
+	try:
+		densityPlot(cell_experiment, width, epsilon, min_radius, max_radius, min_number_robots, max_number_robots, trials, plot_name, reverse = False, hyperbole = False, options = sweepOptions(args))
+	except CheckpointError as error:
+		parser.error(str(error))
 
 	
 if __name__ == '__main__':	
-	main() 
\ No newline at end of file
+	main() 
\ No newline at end of file
@@ -1,10 +1,15 @@
 """
 This code is to experimentally test Scheinerman's Theorem about
 the connectivity threshold for random interval graphs.
+
+For a fixed draw of uniforms, connectivity is monotone in the radius, so
+every sample of a column is reduced to its critical radius, and every row
+of the column is counted from the sorted critical radii.
 """
 
-from DDLP_Connectivity import IntervalGraph, simmetricIntervals
-from DDLP_Random import randomRobotGenerator
+from DDLP_Connectivity import criticalRadii
+from DDLP_Random import makeGenerator, uniforms
+from DDLP_Sweep import sweep, CheckpointError, sweepOptions, openCheckpoint
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
@@ -18,25 +23,20 @@ __author__ = 'Caleb Andrade'
 # HELPER FUNCTIONS
 #******************************************************************************
 
-def experiment(width, radius, n, trials):
+def experiment(width, n, trials, generator = None):
 	"""
-	Experiment
+	Experiment of a whole column.
+	Output: sorted list of the critical radii of trials random instances.
 	"""
-	connected_instances = 0
-
-	for i in range(trials):
-
-		robots = randomRobotGenerator(width, radius, n)
-		intervals = simmetricIntervals(robots)
-		interval_graph = IntervalGraph(intervals)
-
-		if interval_graph.isConnected():
-			connected_instances += 1
+	if generator == None:
+		generator = makeGenerator()
+	units = uniforms(generator, (trials, n, 2))
+	radii = criticalRadii(width*units[:, :, 0], units[:, :, 1])
 			
-	return connected_instances
+	return np.sort(radii).tolist()
 	
 
-def parse_args():
+def argumentParser():
 		import argparse
 		parser = argparse.ArgumentParser()
 		parser.add_argument('infile1', help = 'Width')
@@ -45,8 +45,13 @@ def parse_args():
 		parser.add_argument('infile4', help = 'min_number_robots')
 		parser.add_argument('infile5', help = 'max_number_robots')
 		parser.add_argument('infile6', help = 'Trials')
+		parser.add_argument('--workers', type = int, default = 1, help = 'number of worker processes')
+		parser.add_argument('--seed', type = int, default = None, help = 'seed of the whole grid')
+		parser.add_argument('--checkpoint', default = None, help = 'file where finished cells are persisted (none by default)')
+		parser.add_argument('--resume', action = 'store_true', help = 'skip the cells already finished in the checkpoint (named after the plot by default)')
+		parser.add_argument('--common', action = 'store_true', help = 'share one pool of uniforms among all the cells')
 		
-		return parser.parse_args()
+		return parser
 
 
 def main():
@@ -54,7 +59,8 @@ def main():
 	Main method.
 	"""
 
-	args = parse_args()    
+	parser = argumentParser()
+	args = parser.parse_args()
 	width = float(args.infile1)
 	min_radius = float(args.infile2)
 	max_radius = float(args.infile3)
@@ -68,11 +74,26 @@ def main():
 
 	z = np.empty((rows, cols), int)
 
-	for i in range(rows):
-		radius = min_radius + (i+1)*float(max_radius)/rows
-		print "********************************* number of robots ********************************************** ", i+1
-		for j in range(cols):
-			z[i][j] = experiment(width, radius, j + min_number_robots, trials)
+	pool = None
+	name = 'Scheinerman'
+	if args.common:
+		name += ' common'
+		pool = (trials, max_number_robots, 2)
+	options = sweepOptions(args)
+	radii = [min_radius + (i+1)*float(max_radius)/rows for i in range(rows)]
+	cells = []
+	for j in range(cols):
+		cells.append(((j,), (width, j + min_number_robots, trials)))
+
+	try:
+		store, seed = openCheckpoint(options, 'width='+str(width)+' max_radius='+str(max_radius)+' max_n='+str(max_number_robots)+' trials='+str(trials)+' rows='+str(rows)+' cols='+str(cols)+'_'+name)
+		results = sweep(experiment, cells, options.workers, seed, store = store, common = pool)
+	except CheckpointError as error:
+		parser.error(str(error))
+
+	for (j,), critical_radii in results.items():
+		# connected iff the radius is at least the critical one
+		z[:, j] = np.searchsorted(critical_radii, radii, side = 'right')
 
 	# Creating plot
 	font = {'fontname':'Times New Roman', 'size':'16'}
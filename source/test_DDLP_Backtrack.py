@@ -0,0 +1,363 @@
+"""
+Tests of the Backtrack algorithm against a brute force search, on tiny random instances.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+from DataDelivery import DataDelivery, ActiveRegion
+from DDLP_Bounds import reached
+from DDLP_Backtrack import backtrack, restartBacktrack, luby, SCHEDULES, ORDERS, TranspositionTable
+from DDLP_Backtrack import branchFrontier, parallelBacktrack
+from test_DataDelivery import randomRobots, landing
+
+TRIALS = 300 # number of random instances of every test
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def bruteReach(robots, source):
+	"""
+	Farthest position of the data over all the sequences of distinct robots.
+	"""
+
+	def search(data, used):
+		best = data
+		for i in range(len(robots)):
+			if i not in used:
+				moved = landing(data, robots[i])
+				if moved > data:
+					best = max(best, search(moved, used | set([i])))
+		return best
+
+	return search(source, set())
+
+
+def randomInstance(rng, n = None):
+	"""
+	Returns robots, source, target and whether the target is reachable, with
+	at most 6 robots. Targets too close to the farthest reach are avoided.
+	"""
+
+	if n == None:
+		n = rng.randint(1, 6)
+	robots = randomRobots(rng, n)
+	source = rng.uniform(0, 0.5)
+	farthest = bruteReach(robots, source)
+	target = farthest
+	while abs(target - farthest) < 1e-6:
+		target = rng.uniform(source, 2*farthest - source + 0.01)
+
+	return robots, source, target, target < farthest
+
+
+def isCertificate(robots, source, target, certificate):
+	"""
+	Does certificate move the data from source to target?
+	"""
+
+	ddlp_instance = DataDelivery(robots, source)
+	ddlp_instance.moveRobots(certificate)
+
+	return reached(ddlp_instance.data(), target)
+
+#******************************************************************************
+# BACKTRACK TESTS
+#******************************************************************************
+
+class BacktrackTest(unittest.TestCase):
+	"""
+	Backtrack finds a certificate iff there is one.
+	"""
+
+	def assertSolves(self, robots, source, target, solvable, certificate, stats):
+		"""
+		Checks the answer of a search against the brute force.
+		"""
+
+		self.assertEqual(stats.solved, solvable)
+		self.assertEqual(len(certificate) > 0 or reached(source, target), solvable)
+		if solvable:
+			self.assertTrue(isCertificate(robots, source, target, certificate))
+
+
+	def testBruteForce(self):
+		"""
+		With and without the bounds.
+		"""
+
+		rng = random.Random(6)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			for bounds in [True, False]:
+				ddlp_instance = DataDelivery(robots, source)
+				certificate, stats = backtrack(ddlp_instance, target, rng = rng, bounds = bounds)
+				self.assertSolves(robots, source, target, solvable, certificate, stats)
+				self.assertFalse(stats.limit_reached)
+
+
+	def testInstanceUnchanged(self):
+		"""
+		The instance is left as it was given, also with robots already spent.
+		"""
+
+		rng = random.Random(7)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			ddlp_instance = DataDelivery(robots, source)
+			ddlp_instance.moveRobots([rng.randrange(len(robots)) for step in range(2)])
+			data = ddlp_instance.data()
+			trail = list(ddlp_instance.trail)
+			empty = [ddlp_instance.isEmpty(i) for i in range(len(robots))]
+			backtrack(ddlp_instance, target, rng = rng)
+			self.assertEqual(ddlp_instance.data(), data)
+			self.assertEqual(ddlp_instance.trail, trail)
+			self.assertEqual([ddlp_instance.isEmpty(i) for i in range(len(robots))], empty)
+
+
+	def testLimit(self):
+		"""
+		The node limit is never exceeded.
+		"""
+
+		rng = random.Random(8)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			limit = rng.randint(1, 5)
+			certificate, stats = backtrack(DataDelivery(robots, source), target, limit, rng, bounds = False)
+			self.assertTrue(stats.nodes <= limit)
+			if not stats.solved:
+				self.assertTrue(len(certificate) == 0)
+			elif len(certificate) > 0:
+				self.assertTrue(isCertificate(robots, source, target, certificate))
+
+
+#******************************************************************************
+# TRANSPOSITION TABLE TESTS
+#******************************************************************************
+
+class TranspositionTableTest(unittest.TestCase):
+	"""
+	Domination, least recently used eviction, and searches with and without a table.
+	"""
+
+	def testDominated(self):
+		"""
+		A state is dominated by the farthest failed position of its key.
+		"""
+
+		table = TranspositionTable()
+		self.assertFalse(table.dominated(1, 0.5))
+		table.store(1, 0.5)
+		table.store(1, 0.3)
+		self.assertTrue(table.dominated(1, 0.5))
+		self.assertTrue(table.dominated(1, 0.4))
+		self.assertFalse(table.dominated(1, 0.6))
+		self.assertFalse(table.dominated(2, 0.1))
+		self.assertEqual(len(table), 1)
+
+
+	def testEviction(self):
+		"""
+		The least recently used key is evicted, a lookup counts as a use.
+		"""
+
+		table = TranspositionTable(2)
+		table.store(1, 0.5)
+		table.store(2, 0.5)
+		table.dominated(1, 0.5)
+		table.store(3, 0.5)
+		self.assertEqual(len(table), 2)
+		self.assertEqual(table.evictions, 1)
+		self.assertTrue(table.dominated(1, 0.5))
+		self.assertFalse(table.dominated(2, 0.5))
+		self.assertTrue(table.dominated(3, 0.5))
+		disabled = TranspositionTable(0)
+		disabled.store(1, 0.5)
+		self.assertEqual(len(disabled), 0)
+
+
+	def testSearches(self):
+		"""
+		Searches without a table, with a tiny one, and sharing one, give the same answer.
+		"""
+
+		rng = random.Random(9)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			shared = TranspositionTable()
+			for table in [TranspositionTable(0), TranspositionTable(1), shared, shared]:
+				certificate, stats = backtrack(DataDelivery(robots, source), target, rng = rng, table = table, bounds = False)
+				self.assertEqual(stats.solved, solvable)
+				if solvable:
+					self.assertTrue(isCertificate(robots, source, target, certificate))
+
+
+#******************************************************************************
+# RESTARTS TESTS
+#******************************************************************************
+
+def lubyDefinition(i):
+	"""
+	i-th term of the Luby sequence, by its recursive definition.
+	"""
+
+	k = 1
+	while (1 << k) - 1 < i:
+		k += 1
+	if i == (1 << k) - 1:
+		return 1 << (k - 1)
+
+	return lubyDefinition(i - (1 << (k - 1)) + 1)
+
+
+class RestartTest(unittest.TestCase):
+	"""
+	Schedules, budgets and answers of restartBacktrack.
+	"""
+
+	def testLuby(self):
+		"""
+		The first terms, and the recursive definition.
+		"""
+
+		self.assertEqual([luby(i) for i in range(1, 16)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+		for i in range(1, 300):
+			self.assertEqual(luby(i), lubyDefinition(i))
+
+
+	def testBudget(self):
+		"""
+		The budget is never exceeded, and the answers agree with the brute force.
+		"""
+
+		rng = random.Random(22)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			for schedule in SCHEDULES:
+				budget = rng.randint(1, 12)
+				certificate, stats = restartBacktrack(DataDelivery(robots, source), target, budget, schedule, 1, rng, bounds = False)
+				self.assertTrue(stats.nodes <= budget)
+				if stats.solved and len(certificate) > 0:
+					self.assertTrue(isCertificate(robots, source, target, certificate))
+				if stats.limit_reached:
+					self.assertFalse(stats.solved)
+					self.assertEqual(stats.nodes, budget)
+				else:
+					self.assertEqual(stats.solved, solvable)
+				certificate, stats = restartBacktrack(DataDelivery(robots, source), target, 10**6, schedule, 1, rng)
+				self.assertEqual(stats.solved, solvable)
+				self.assertFalse(stats.limit_reached)
+		self.assertRaises(ValueError, restartBacktrack, DataDelivery(robots, source), target, 10, 'linear')
+
+
+#******************************************************************************
+# CHILD ORDERS TESTS
+#******************************************************************************
+
+class OrderTest(unittest.TestCase):
+	"""
+	The orders permute the children, and every order gives the same answers.
+	"""
+
+	def testPermutations(self):
+		"""
+		The children are permuted in place, the state is left as it was.
+		"""
+
+		rng = random.Random(23)
+		for trial in range(50):
+			robots, source, target, solvable = randomInstance(rng, 6)
+			ddlp_instance = DataDelivery(robots, source)
+			region = ActiveRegion(ddlp_instance)
+			for name in ORDERS:
+				children = region.rightTriangle()
+				ORDERS[name](children, ddlp_instance, region, rng)
+				self.assertEqual(sorted(children), region.rightTriangle(), name)
+				self.assertEqual(ddlp_instance.data(), source)
+				self.assertEqual(ddlp_instance.trail, [])
+
+
+	def testBruteForce(self):
+		"""
+		Every order finds a certificate iff there is one.
+		"""
+
+		rng = random.Random(24)
+		for trial in range(100):
+			robots, source, target, solvable = randomInstance(rng)
+			for name in ORDERS:
+				certificate, stats = backtrack(DataDelivery(robots, source), target, rng = rng, bounds = False, order = name)
+				self.assertEqual(stats.solved, solvable, name)
+				if solvable:
+					self.assertTrue(isCertificate(robots, source, target, certificate), name)
+		self.assertRaises(ValueError, backtrack, DataDelivery(robots, source), target, order = 'unknown')
+
+
+#******************************************************************************
+# PARALLEL BACKTRACK TESTS
+#******************************************************************************
+
+class ParallelTest(unittest.TestCase):
+	"""
+	Frontiers of branches, and searches of the branches on worker processes.
+	"""
+
+	def testFrontier(self):
+		"""
+		A solvable instance is solved by the expansion or by one of its branches.
+		"""
+
+		rng = random.Random(25)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			ddlp_instance = DataDelivery(robots, source)
+			certificate, frontier = branchFrontier(ddlp_instance, target, rng.randint(1, 8), rng = rng)
+			self.assertEqual(ddlp_instance.data(), source)
+			self.assertEqual(ddlp_instance.trail, [])
+			if len(certificate) > 0 or reached(source, target):
+				self.assertTrue(solvable)
+				self.assertTrue(isCertificate(robots, source, target, certificate))
+				continue
+			found = False
+			for moves in frontier:
+				ddlp_instance.moveRobots(moves)
+				branch, stats = backtrack(ddlp_instance, target, rng = rng)
+				ddlp_instance.reset()
+				if stats.solved:
+					self.assertTrue(isCertificate(robots, source, target, moves + branch))
+					found = True
+			self.assertEqual(found, solvable)
+
+
+	def testWorkers(self):
+		"""
+		Searches on worker processes and the seeded sequential path agree with
+		backtrack, on instances large enough to reach the workers.
+		"""
+
+		rng = random.Random(26)
+		branches = 0
+		for trial in range(20):
+			robots = randomRobots(rng, 12, radius = 0.25)
+			target = rng.uniform(0.5, 1.1)
+			solvable = backtrack(DataDelivery(robots, 0.3), target, bounds = False)[1].solved
+			certificate, stats = parallelBacktrack(DataDelivery(robots, 0.3), target, 2, branches = 4, seed = trial)
+			branches += stats.branches
+			self.assertEqual(stats.solved, solvable)
+			if solvable:
+				self.assertTrue(isCertificate(robots, 0.3, target, certificate))
+			certificate, stats = parallelBacktrack(DataDelivery(robots, 0.3), target, 1, seed = trial)
+			self.assertEqual(stats.solved, solvable)
+			self.assertEqual(parallelBacktrack(DataDelivery(robots, 0.3), target, 1, seed = trial)[0], certificate)
+		self.assertTrue(branches > 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests of the bounds of DDLP_Bounds against a brute force search, on tiny random instances.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+from DataDelivery import DataDelivery, ActiveRegion
+from DDLP_Bounds import EPSILON, BOUNDS, reached, infeasibilityReason, nodeInfeasibility
+from test_DataDelivery import randomRobots, spent
+from test_DDLP_Backtrack import TRIALS, bruteReach, randomInstance
+
+#******************************************************************************
+# BOUNDS TESTS
+#******************************************************************************
+
+class BoundsTest(unittest.TestCase):
+	"""
+	The bounds never reject a solvable instance or node.
+	"""
+
+	def testReached(self):
+		"""
+		The margin is relative to the target.
+		"""
+
+		self.assertTrue(reached(1.0, 1.0))
+		self.assertTrue(reached(1.0 - EPSILON/2, 1.0))
+		self.assertFalse(reached(1.0 - 2*EPSILON, 1.0))
+		self.assertTrue(reached(1000.0 - 500*EPSILON, 1000.0))
+		self.assertFalse(reached(0.5, 1.0))
+
+
+	def testBounds(self):
+		"""
+		Every bound is at least the farthest reach.
+		"""
+
+		rng = random.Random(10)
+		for trial in range(TRIALS):
+			robots = randomRobots(rng, rng.randint(0, 6))
+			source = rng.uniform(0, 0.5)
+			farthest = bruteReach(robots, source)
+			for name, bound in BOUNDS:
+				self.assertTrue(reached(bound(robots, source), farthest), name)
+
+
+	def testInfeasibility(self):
+		"""
+		Solvable instances are never rejected.
+		"""
+
+		rng = random.Random(11)
+		rejected = 0
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			reason = infeasibilityReason(robots, source, target)
+			if solvable:
+				self.assertEqual(reason, None)
+			elif reason != None:
+				rejected += 1
+		self.assertTrue(rejected > 0)
+
+
+	def testNodes(self):
+		"""
+		Nodes from which the target can be reached are never cut.
+		"""
+
+		rng = random.Random(12)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			ddlp_instance = DataDelivery(robots, source)
+			for step in range(3):
+				region = ActiveRegion(ddlp_instance)
+				removed = spent(ddlp_instance)
+				left = [robots[i] for i in range(len(robots)) if i not in removed]
+				if reached(bruteReach(left, ddlp_instance.data()), target):
+					self.assertEqual(nodeInfeasibility(region, target), None)
+				ddlp_instance.move(rng.randrange(len(robots)))
+
+
+if __name__ == '__main__':
+	unittest.main()
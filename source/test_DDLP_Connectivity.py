@@ -0,0 +1,161 @@
+"""
+Tests of the interval graphs and the critical radii of DDLP_Connectivity.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+import numpy as np
+from DDLP_Connectivity import IntervalGraph, criticalRadii
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def isConnected(positions, energies, radius):
+	"""
+	Is the interval graph of the intervals (x_i - e_i*r, x_i + e_i*r) connected?
+	"""
+
+	intervals = [(positions[i] - energies[i]*radius, positions[i] + energies[i]*radius) for i in range(len(positions))]
+
+	return IntervalGraph(intervals).isConnected()
+
+
+def randomIntervals(rng, n):
+	"""
+	Returns n random closed intervals, with integer endpoints half of the
+	time so that some of them touch.
+	"""
+
+	intervals = []
+	for i in range(n):
+		if rng.random() < 0.5:
+			a = rng.randint(0, 10)
+			b = a + rng.randint(0, 3)
+		else:
+			a = rng.uniform(0, 10)
+			b = a + rng.uniform(0, 3)
+		intervals.append((a, b))
+
+	return intervals
+
+
+def bruteComponents(intervals):
+	"""
+	Adjacency (sets) of every pair of intersecting intervals, and the
+	components as sets of intervals, by a search from every interval.
+	"""
+
+	n = len(intervals)
+	adjacency = [set([j for j in range(n) if j != i and intervals[i][0] <= intervals[j][1] and intervals[j][0] <= intervals[i][1]]) for i in range(n)]
+	components = []
+	seen = set()
+	for i in range(n):
+		if i not in seen:
+			component = set([i])
+			stack = [i]
+			while len(stack) > 0:
+				for j in adjacency[stack.pop()]:
+					if j not in component:
+						component.add(j)
+						stack.append(j)
+			seen |= component
+			components.append(component)
+
+	return adjacency, components
+
+
+def bruteCriticalRadius(positions, energies):
+	"""
+	Smallest radius at which two intervals touch and the graph is connected,
+	scanning the radii at which every pair of intervals touches.
+	"""
+
+	candidates = [0.0]
+	for i in range(len(positions)):
+		for j in range(len(positions)):
+			if positions[i] < positions[j] and energies[i] + energies[j] > 0:
+				candidates.append((positions[j] - positions[i])/(energies[i] + energies[j]))
+	for radius in sorted(candidates):
+		if isConnected(positions, energies, radius*(1 + 1e-12)):
+			return radius
+
+	return float('inf')
+
+#******************************************************************************
+# CRITICAL RADII TESTS
+#******************************************************************************
+
+class CriticalRadiiTest(unittest.TestCase):
+	"""
+	The bisection of criticalRadii against the interval graphs.
+	"""
+
+	def testBruteForce(self):
+		"""
+		Random batches, the radius found is the smallest connected one.
+		"""
+
+		generator = np.random.RandomState(14)
+		for n in range(1, 9):
+			positions = generator.random_sample((30, n))
+			energies = generator.random_sample((30, n))
+			radii = criticalRadii(positions, energies)
+			for t in range(30):
+				expected = bruteCriticalRadius(positions[t], energies[t])
+				self.assertTrue(abs(radii[t] - expected) <= 1e-9*max(1.0, expected))
+				self.assertTrue(isConnected(positions[t], energies[t], radii[t]*(1 + 1e-9)))
+				if radii[t] > 0:
+					self.assertFalse(isConnected(positions[t], energies[t], radii[t]*(1 - 1e-9)))
+
+
+	def testEdgeCases(self):
+		"""
+		No robots, one robot, and robots at the same position.
+		"""
+
+		self.assertTrue(np.isinf(criticalRadii(np.empty((2, 0)), np.empty((2, 0)))).all())
+		self.assertEqual(criticalRadii(np.array([[0.3]]), np.array([[0.0]]))[0], 0.0)
+		self.assertEqual(criticalRadii(np.array([[0.3, 0.3]]), np.array([[0.1, 0.2]]))[0], 0.0)
+		self.assertAlmostEqual(criticalRadii(np.array([[0.0, 1.0]]), np.array([[0.5, 0.5]]))[0], 1.0)
+
+
+#******************************************************************************
+# INTERVAL GRAPH TESTS
+#******************************************************************************
+
+class IntervalGraphTest(unittest.TestCase):
+	"""
+	The sweep of the components and the lazy adjacency list against every pair.
+	"""
+
+	def testBruteForce(self):
+		"""
+		Components, count and adjacency on random intervals.
+		"""
+
+		rng = random.Random(9)
+		for trial in range(300):
+			intervals = randomIntervals(rng, rng.randint(1, 12))
+			adjacency, components = bruteComponents(intervals)
+			graph = IntervalGraph(intervals)
+			self.assertEqual(graph.adjacency, None)
+			self.assertEqual(graph.count, len(components))
+			self.assertEqual(graph.isConnected(), len(components) == 1)
+			labels = graph.getComponents()
+			for component in components:
+				self.assertEqual(len(set([labels[i] for i in component])), 1)
+			self.assertEqual(len(set(labels)), len(components))
+			self.assertEqual([set(neighbours) for neighbours in graph.graph], adjacency)
+			self.assertEqual([len(neighbours) for neighbours in graph.graph], [len(neighbours) for neighbours in adjacency])
+			self.assertEqual(IntervalGraph(intervals, adjacency = True).adjacency, graph.graph)
+
+
+if __name__ == '__main__':
+	unittest.main()
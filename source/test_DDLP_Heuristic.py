@@ -0,0 +1,189 @@
+"""
+Tests of the greedy heuristics of DDLP_Heuristic against their scalar versions.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+import numpy as np
+from DataDelivery import DataDelivery, dataTriangle
+from DDLP_Heuristic import closestRobot, highestCapacity, lessCapacity, lowestReach, quotientHeuristic
+from DDLP_Heuristic import remainingCapacity, pairHeuristic, brutePair, pairHeuristicChoice
+from DDLP_Heuristic import greedyHeuristic, RIGHT_KEYS, PAIR_STRATEGIES
+from test_DataDelivery import randomRobots
+
+TRIALS = 300 # number of random instances of every test
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def randomTriangle(rng, n):
+	"""
+	Returns robots (x_i, rho_i), the data position and the indices of the
+	robots in its right triangle.
+	"""
+
+	robots = randomRobots(rng, n)
+	data = rng.uniform(0, 0.5)
+	triangle = [i for i in range(n) if robots[i][0] > data and robots[i][0] - robots[i][1] < data]
+
+	return robots, data, triangle
+
+
+def scalarGreedy(robots, source, choose):
+	"""
+	The greedy heuristic from dataTriangle: the robot of highest capacity
+	of the left triangle, else choose(triangle, remaining, data) in the right
+	triangle (robots (x_i, rho_i, i) sorted by index).
+	Output: certificate, data
+	"""
+
+	ddlp_instance = DataDelivery(robots, source)
+	robots = ddlp_instance.indexedRobots()
+	certificate = []
+	while True:
+		data = ddlp_instance.data()
+		remaining = [robot for robot in robots if not ddlp_instance.isEmpty(robot[2])]
+		remaining.sort(key = lambda robot: robot[0] - robot[1])
+		left, right = dataTriangle(data, list(remaining))
+		if len(left) > 0:
+			robot = highestCapacity(data, sorted(left, key = lambda robot: robot[2]))
+		elif len(right) > 0:
+			robot = choose(sorted(right, key = lambda robot: robot[2]), remaining, data)
+		else:
+			break
+		certificate.append(robot[2])
+		ddlp_instance.move(robot[2])
+
+	return certificate, ddlp_instance.data()
+
+# scalar choices in the right triangle of the RIGHT_KEYS heuristics
+SCALAR_RIGHT = {
+	'closest_robot': lambda triangle, robots, data: closestRobot(data, triangle),
+	'lowest_reach': lambda triangle, robots, data: lowestReach(triangle),
+	'highest_capacity': lambda triangle, robots, data: highestCapacity(data, triangle),
+	'less_capacity': lambda triangle, robots, data: lessCapacity(data, triangle)}
+
+
+def scalarBestRobot(triangle, robots, data):
+	"""
+	bestRobot, every candidate evaluated against the same robots (bestRobot's
+	dataTriangle removes robots from the shared list).
+	"""
+
+	best_robot = triangle[0]
+	max_value = 0
+	for robot in triangle:
+		new_data = data + robot[1] - abs(robot[0] - data)
+		value = sum(remainingCapacity(robot, list(robots), data)) + new_data
+		if value > max_value:
+			best_robot = robot
+			max_value = value
+
+	return best_robot
+
+
+# scalar choices in the right triangle of the PAIR_STRATEGIES, the first robot if they find none
+SCALAR_PAIR = {
+	'best_robot': scalarBestRobot,
+	'pair_heuristic': lambda triangle, robots, data: pairHeuristic(triangle, data),
+	'brute_pair': lambda triangle, robots, data: brutePair(triangle, data),
+	'quotient': lambda triangle, robots, data: quotientHeuristic(triangle, data) or triangle[0]}
+
+#******************************************************************************
+# PAIR STRATEGIES TESTS
+#******************************************************************************
+
+class PairChoiceTest(unittest.TestCase):
+	"""
+	The NumPy choices in the right triangle against the scalar heuristics.
+	"""
+
+	def testPairHeuristic(self):
+		"""
+		The same winner of the comparisons as pairHeuristic.
+		"""
+
+		rng = random.Random(20)
+		for trial in range(TRIALS):
+			robots, data, triangle = randomTriangle(rng, rng.randint(1, 12))
+			if len(triangle) == 0:
+				continue
+			x = np.array([robot[0] for robot in robots])
+			rho = np.array([robot[1] for robot in robots])
+			choice = pairHeuristicChoice(np.array(triangle, int), x, rho, None, data)
+			self.assertEqual(robots[choice], pairHeuristic([robots[i] for i in triangle], data))
+
+
+#******************************************************************************
+# GREEDY HEURISTIC TESTS
+#******************************************************************************
+
+class GreedyTest(unittest.TestCase):
+	"""
+	greedyHeuristic (with TriangleHeaps) against the greedy from dataTriangle.
+	"""
+
+	def assertGreedy(self, heuristic, scalar):
+		"""
+		The same certificate and data on random instances, the instance is reset.
+		"""
+
+		rng = random.Random(18)
+		for trial in range(TRIALS):
+			robots = randomRobots(rng, rng.randint(0, 12))
+			source = rng.uniform(0, 0.5)
+			ddlp_instance = DataDelivery(robots, source)
+			certificate, data = greedyHeuristic(ddlp_instance, heuristic)
+			self.assertEqual((certificate, data), scalarGreedy(robots, source, scalar), heuristic)
+			self.assertEqual(ddlp_instance.data(), source)
+
+
+	def testRightKeys(self):
+		"""
+		Every heap strategy.
+		"""
+
+		for heuristic in RIGHT_KEYS:
+			self.assertGreedy(heuristic, SCALAR_RIGHT[heuristic])
+
+
+	def testPairStrategies(self):
+		"""
+		Every NumPy strategy.
+		"""
+
+		for heuristic in PAIR_STRATEGIES:
+			self.assertGreedy(heuristic, SCALAR_PAIR[heuristic])
+
+
+	def testRandomSampling(self):
+		"""
+		Every move of random sampling moves the data, until both triangles are empty.
+		"""
+
+		rng = random.Random(19)
+		for trial in range(TRIALS):
+			robots = randomRobots(rng, rng.randint(0, 12))
+			source = rng.uniform(0, 0.5)
+			certificate, data = greedyHeuristic(DataDelivery(robots, source), 'random_sampling')
+			self.assertEqual(len(set(certificate)), len(certificate))
+			ddlp_instance = DataDelivery(robots, source)
+			for robot in certificate:
+				before = ddlp_instance.data()
+				ddlp_instance.move(robot)
+				self.assertTrue(ddlp_instance.data() > before)
+			self.assertEqual(ddlp_instance.data(), data)
+			remaining = [robot for robot in ddlp_instance.robotsList() if not ddlp_instance.isEmpty(robots.index(robot))]
+			self.assertEqual(dataTriangle(data, remaining), ([], []))
+		self.assertRaises(ValueError, greedyHeuristic, DataDelivery(robots, source), 'unknown')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests of the kernelization of DDLP_Kernel against a brute force search.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+import numpy as np
+from DataDelivery import DataDelivery
+from DDLP_Bounds import reached
+from DDLP_Backtrack import backtrack
+from DDLP_Kernel import kernelize
+from test_DDLP_Backtrack import TRIALS, bruteReach, randomInstance, isCertificate
+
+#******************************************************************************
+# KERNEL TESTS
+#******************************************************************************
+
+class KernelTest(unittest.TestCase):
+	"""
+	The kernel is solvable iff the instance is, and its certificates map back.
+	"""
+
+	def testBruteForce(self):
+		"""
+		Solving the kernel answers the instance.
+		"""
+
+		rng = random.Random(24)
+		for trial in range(TRIALS):
+			robots, source, target, solvable = randomInstance(rng)
+			kernel = kernelize(robots, source, target)
+			self.assertEqual(len(kernel) + len(kernel.prefix) + kernel.useless + kernel.unreachable, len(robots))
+			self.assertEqual(reached(bruteReach(kernel.robots, kernel.source), target), solvable)
+			certificate, stats = backtrack(DataDelivery(kernel.robots, kernel.source), target, rng = rng)
+			self.assertEqual(stats.solved, solvable)
+			if solvable:
+				self.assertTrue(isCertificate(robots, source, target, kernel.certificate(certificate)))
+
+
+	def testNumPyInput(self):
+		"""
+		A NumPy array gives the same kernel as a list.
+		"""
+
+		rng = random.Random(25)
+		for trial in range(50):
+			robots, source, target, solvable = randomInstance(rng)
+			kernel = kernelize(robots, source, target)
+			other = kernelize(np.array(robots), source, target)
+			self.assertEqual(other.robots, kernel.robots)
+			self.assertEqual((other.source, other.indices, other.prefix), (kernel.source, kernel.indices, kernel.prefix))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,216 @@
+"""
+Tests of the batch generator, the common pool and the confidence intervals of DDLP_Random.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import math
+import unittest
+import numpy as np
+from DDLP_Random import makeGenerator, uniforms, sortBatch, randomRobotBatch, scaledBatch, CommonPool, POOLS, binomialCDF, wilsonInterval, clopperPearsonInterval, INTERVALS
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def binomial(k, samples, p):
+	"""
+	Probability of exactly k successes, straight from the definition.
+	"""
+
+	combinations = math.factorial(samples)//(math.factorial(k)*math.factorial(samples - k))
+
+	return combinations*p**k*(1 - p)**(samples - k)
+
+
+def coverage(interval, samples, p):
+	"""
+	Exact probability that interval(successes, samples) contains p.
+	"""
+
+	total = 0.0
+	for k in range(samples + 1):
+		lower, upper = interval(k, samples)
+		if lower <= p <= upper:
+			total += binomial(k, samples, p)
+
+	return total
+
+#******************************************************************************
+# CONFIDENCE INTERVAL TESTS
+#******************************************************************************
+
+class IntervalTest(unittest.TestCase):
+	"""
+	Binomial tails, known values and coverage of the intervals.
+	"""
+
+	def testBinomialCDF(self):
+		"""
+		Against the sum of the probabilities.
+		"""
+
+		for samples in [1, 5, 12]:
+			for p in [0.0, 0.1, 0.5, 0.93, 1.0]:
+				for k in range(-1, samples + 1):
+					expected = sum([binomial(i, samples, p) for i in range(k + 1)])
+					self.assertAlmostEqual(binomialCDF(k, samples, p), expected)
+
+
+	def testKnownValues(self):
+		"""
+		Closed forms of the extreme cases, and a symmetric Wilson interval.
+		"""
+
+		for name in INTERVALS:
+			self.assertEqual(INTERVALS[name](0, 0), (0.0, 1.0))
+		tail = math.erfc(1.96/math.sqrt(2))/2 # about 0.025
+		self.assertAlmostEqual(clopperPearsonInterval(0, 10)[1], 1 - tail**0.1)
+		self.assertAlmostEqual(clopperPearsonInterval(10, 10)[0], tail**0.1)
+		self.assertEqual(clopperPearsonInterval(0, 10)[0], 0.0)
+		self.assertEqual(clopperPearsonInterval(10, 10)[1], 1.0)
+		lower, upper = wilsonInterval(5, 10)
+		self.assertAlmostEqual(lower + upper, 1.0)
+		self.assertAlmostEqual(lower, 0.236593, 5)
+
+
+	def testIntervals(self):
+		"""
+		Every interval is in [0, 1], contains the estimate, and narrows with more samples.
+		"""
+
+		for name in INTERVALS:
+			interval = INTERVALS[name]
+			for samples in [1, 7, 30]:
+				for k in range(samples + 1):
+					lower, upper = interval(k, samples)
+					self.assertTrue(0.0 <= lower <= float(k)/samples <= upper <= 1.0)
+					wider = interval(k, samples, z = 2.58)
+					self.assertTrue(wider[0] <= lower + 1e-12 and upper <= wider[1] + 1e-12)
+			self.assertTrue(interval(40, 400)[1] - interval(40, 400)[0] < interval(4, 40)[1] - interval(4, 40)[0])
+
+
+	def testCoverage(self):
+		"""
+		Clopper-Pearson covers p at least 95% of the time, Wilson about as often.
+		"""
+
+		for samples in [10, 25]:
+			for p in [0.05, 0.3, 0.5, 0.8]:
+				self.assertTrue(coverage(clopperPearsonInterval, samples, p) >= 0.95)
+				self.assertTrue(coverage(wilsonInterval, samples, p) >= 0.85)
+
+
+#******************************************************************************
+# BATCH GENERATOR TESTS
+#******************************************************************************
+
+class BatchTest(unittest.TestCase):
+	"""
+	Shape, range, order and reproducibility of the random batches.
+	"""
+
+	def testBatch(self):
+		"""
+		Robots in the rectangle, every instance sorted by x_i - rho_i.
+		"""
+
+		batch = randomRobotBatch(2.0, 0.5, 7, 40, makeGenerator(1))
+		self.assertEqual(batch.shape, (40, 7, 2))
+		self.assertTrue((batch[:, :, 0] >= 0).all() and (batch[:, :, 0] < 2.0).all())
+		self.assertTrue((batch[:, :, 1] >= 0).all() and (batch[:, :, 1] < 0.5).all())
+		lower = batch[:, :, 0] - batch[:, :, 1]
+		self.assertTrue((lower[:, 1:] >= lower[:, :-1]).all())
+		self.assertEqual(randomRobotBatch(1.0, 0.1, 0, 3, makeGenerator(1)).shape, (3, 0, 2))
+
+
+	def testSeeds(self):
+		"""
+		The same seed gives the same batch, and scaledBatch the same instances.
+		"""
+
+		batch = randomRobotBatch(2.0, 0.5, 7, 40, makeGenerator(2))
+		self.assertTrue((randomRobotBatch(2.0, 0.5, 7, 40, makeGenerator(2)) == batch).all())
+		self.assertFalse((randomRobotBatch(2.0, 0.5, 7, 40, makeGenerator(3)) == batch).all())
+		units = uniforms(makeGenerator(2), (40, 7, 2))
+		copy = units.copy()
+		self.assertTrue(np.allclose(scaledBatch(units, 2.0, 0.5), batch))
+		self.assertTrue((units == copy).all())
+
+
+	def testSort(self):
+		"""
+		Sorting permutes the robots of every instance, in place.
+		"""
+
+		units = uniforms(makeGenerator(4), (20, 6, 2))
+		batch = units.copy()
+		self.assertTrue(sortBatch(batch) is batch)
+		for t in range(20):
+			self.assertEqual(sorted(map(tuple, batch[t])), sorted(map(tuple, units[t])))
+
+
+#******************************************************************************
+# COMMON POOL TESTS
+#******************************************************************************
+
+class CommonPoolTest(unittest.TestCase):
+	"""
+	Slices of the pool of uniforms.
+	"""
+
+	def testSlices(self):
+		"""
+		Consecutive draws take the next trials, cut to their first robots.
+		"""
+
+		shape = (10, 6, 2)
+		pool = uniforms(makeGenerator(5), shape)
+		common = CommonPool(5, shape)
+		self.assertTrue((uniforms(common, (3, 6, 2)) == pool[:3]).all())
+		self.assertTrue((uniforms(common, (4, 2, 2)) == pool[3:7, :2]).all())
+		self.assertTrue((uniforms(CommonPool(5, shape), (10, 6, 2)) == pool).all())
+
+
+	def testCopies(self):
+		"""
+		Draws are copies, sorting one does not change the pool.
+		"""
+
+		shape = (4, 3, 2)
+		sample = uniforms(CommonPool(6, shape), shape)
+		expected = sample.copy()
+		sample.sort(axis = 1)
+		self.assertTrue((uniforms(CommonPool(6, shape), shape) == expected).all())
+
+
+	def testOverflow(self):
+		"""
+		Draws beyond the pool are refused.
+		"""
+
+		common = CommonPool(7, (4, 3, 2))
+		self.assertRaises(ValueError, uniforms, common, (2, 4, 2))
+		uniforms(common, (3, 3, 2))
+		self.assertRaises(ValueError, uniforms, common, (2, 3, 2))
+
+
+	def testSinglePool(self):
+		"""
+		Only the pool of the last seed and shape is kept.
+		"""
+
+		for seed in range(5):
+			uniforms(CommonPool(seed, (4, 3, 2)), (1, 3, 2))
+			self.assertEqual(POOLS.keys(), [(seed, (4, 3, 2))])
+		uniforms(CommonPool(4, (5, 3, 2)), (1, 3, 2))
+		self.assertEqual(POOLS.keys(), [(4, (5, 3, 2))])
+		self.assertTrue((uniforms(CommonPool(0, (4, 3, 2)), (4, 3, 2)) == uniforms(makeGenerator(0), (4, 3, 2))).all())
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests of the heap-based reverseHeuristic against the scan of every candidate.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+from DataDelivery import DataDelivery
+from DDLP_ReverseHeuristic import reverseHeuristic, difference, REVERSE_KEYS
+from test_DataDelivery import randomRobots
+
+TRIALS = 300 # number of random instances of every test
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def scanReverseHeuristic(robots, heuristic_type, source, target):
+	"""
+	reverseHeuristic scanning all the robots for the candidates at every step.
+	"""
+
+	available_robots = range(len(robots))
+	certificate = []
+	targets = []
+
+	while True:
+		candidates = []
+		for index in available_robots:
+			robot = robots[index]
+			if round(robot[0] - robot[1],10) < round(target,10) <= round(robot[0] + robot[1],10):
+				candidates.append(index)
+		if len(candidates) == 0:
+			return [],[]
+
+		values = {
+			"max_x": lambda index: (-robots[index][0], index),
+			"min_x": lambda index: (robots[index][0], index),
+			"max_s": lambda index: (-difference(robots[index], target), index),
+			"min_s": lambda index: (difference(robots[index], target), index),
+			"hlr": lambda index: (-(robots[index][0] - robots[index][1]), -index)}
+		best_robot = min(candidates, key = values[heuristic_type])
+
+		target = robots[best_robot][0] - difference(robots[best_robot], target)
+		certificate.append(best_robot)
+		targets.append(target)
+		available_robots.remove(best_robot)
+
+		if target <= source:
+			certificate.reverse()
+			targets.reverse()
+			return certificate, targets
+
+#******************************************************************************
+# REVERSE HEURISTIC TESTS
+#******************************************************************************
+
+class ReverseHeuristicTest(unittest.TestCase):
+	"""
+	The same certificates and targets as the scan, for every criterion.
+	"""
+
+	def testScan(self):
+		"""
+		Random instances, the certificates found move the data to the target.
+		"""
+
+		rng = random.Random(19)
+		solved = 0
+		for trial in range(TRIALS):
+			robots = randomRobots(rng, rng.randint(0, 12))
+			rng.shuffle(robots)
+			source, target = rng.uniform(0, 0.3), rng.uniform(0.5, 1.0)
+			for heuristic in REVERSE_KEYS:
+				certificate, targets = reverseHeuristic(robots, heuristic, source, target)
+				self.assertEqual((certificate, targets), scanReverseHeuristic(robots, heuristic, source, target), heuristic)
+				if len(certificate) > 0:
+					solved += 1
+					ddlp_instance = DataDelivery(robots, source)
+					ddlp_instance.moveRobots(certificate)
+					self.assertTrue(ddlp_instance.data() >= target - 1e-9)
+		self.assertTrue(solved > 0)
+		self.assertRaises(ValueError, reverseHeuristic, robots, 'unknown', source, target)
+
+
+	def testTies(self):
+		"""
+		Robots at the same position, ties go to the first robot (the last for hlr).
+		"""
+
+		robots = [(0.5, 0.3), (0.5, 0.3), (0.2, 0.4), (0.2, 0.4)]
+		for heuristic in REVERSE_KEYS:
+			self.assertEqual(reverseHeuristic(robots, heuristic, 0.1, 0.7), scanReverseHeuristic(robots, heuristic, 0.1, 0.7), heuristic)
+
+
+if __name__ == '__main__':
+	unittest.main()
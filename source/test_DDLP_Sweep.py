@@ -0,0 +1,178 @@
+"""
+Tests of the cell seeds, the checkpoint store and the refined sweeps of DDLP_Sweep.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from StringIO import StringIO
+from DDLP_Random import uniforms
+from DDLP_Sweep import cellSeed, sweep, refinedSweep, CheckpointStore, CheckpointError, SweepOptions, openCheckpoint
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def drawExperiment(n, generator = None):
+	"""
+	Toy experiment of a cell: the sum of n uniforms.
+	"""
+
+	return float(uniforms(generator, (n,)).sum())
+
+#******************************************************************************
+# SWEEP TESTS
+#******************************************************************************
+
+class SweepTest(unittest.TestCase):
+	"""
+	Seeds, checkpoints and resumed sweeps.
+	"""
+
+	def setUp(self):
+		self.folder = tempfile.mkdtemp()
+		self.filename = os.path.join(self.folder, 'checkpoint.jsonl')
+		self.stdout = sys.stdout
+		sys.stdout = StringIO() # progress lines
+
+
+	def tearDown(self):
+		sys.stdout = self.stdout
+		shutil.rmtree(self.folder)
+
+
+	def testCellSeed(self):
+		"""
+		Deterministic 32 bit seeds, different for different keys and sweeps.
+		"""
+
+		keys = [(i, j) for i in range(20) for j in range(20)]
+		seeds = [cellSeed(7, key) for key in keys]
+		self.assertEqual(seeds, [cellSeed(7, key) for key in keys])
+		self.assertEqual(len(set(seeds)), len(keys))
+		self.assertTrue(all([0 <= seed < 2**32 for seed in seeds]))
+		self.assertNotEqual(seeds, [cellSeed(8, key) for key in keys])
+
+
+	def testWorkers(self):
+		"""
+		The results do not depend on the number of workers.
+		"""
+
+		cells = [((i, j), (i + j + 1,)) for i in range(3) for j in range(3)]
+		self.assertEqual(sweep(drawExperiment, cells, 2, seed = 4), sweep(drawExperiment, cells, seed = 4))
+
+
+	def testRefinedSweep(self):
+		"""
+		A fully refined sweep gives the grid of sweep, the leaves of any
+		refinement cover the grid once with the results of sweep.
+		"""
+
+		rows, cols = 7, 5
+		arguments = lambda i, j: (i + j + 1,)
+		cells = [((i, j), arguments(i, j)) for i in range(rows) for j in range(cols)]
+		expected = sweep(drawExperiment, cells, seed = 5)
+		results, leaves = refinedSweep(drawExperiment, arguments, rows, cols, 2, lambda result: 0, seed = 5)
+		self.assertEqual(results, expected)
+		self.assertEqual(sorted([leaf[4] for leaf in leaves]), sorted(expected.keys()))
+		for a, b, c, d, key in leaves:
+			self.assertEqual((b - a, d - c, key), (1, 1, (a, c)))
+		side = lambda result: int(result > 4) - int(result < 2)
+		for levels in range(4):
+			results, leaves = refinedSweep(drawExperiment, arguments, rows, cols, levels, side, seed = 5)
+			covered = [[0]*cols for i in range(rows)]
+			for a, b, c, d, key in leaves:
+				self.assertTrue(a <= key[0] < b and c <= key[1] < d)
+				self.assertEqual(results[key], expected[key])
+				if b - a > 1 or d - c > 1:
+					# blocks in the band are split
+					self.assertNotEqual(side(results[key]), 0)
+				for i in range(a, b):
+					for j in range(c, d):
+						covered[i][j] += 1
+			self.assertEqual(covered, [[1]*cols for i in range(rows)])
+
+
+	def testResume(self):
+		"""
+		A resumed sweep runs only the missing cells, with the same results.
+		"""
+
+		cells = [((i,), (i + 1,)) for i in range(6)]
+		expected = sweep(drawExperiment, cells, seed = 3)
+		store = CheckpointStore(self.filename)
+		sweep(drawExperiment, cells[:4], seed = 3, store = store)
+		store = CheckpointStore(self.filename, resume = True)
+		self.assertEqual(store.seed(), 3)
+		self.assertTrue(store.done((0,), (1,), cellSeed(3, (0,))))
+		self.assertFalse(store.done((5,), (6,), cellSeed(3, (5,))))
+		self.assertEqual(sweep(drawExperiment, cells, seed = 3, store = store), expected)
+		self.assertEqual(len(CheckpointStore(self.filename, resume = True).records), 6)
+
+
+	def testTruncatedTail(self):
+		"""
+		A record cut short by a crash is dropped from the file.
+		"""
+
+		store = CheckpointStore(self.filename)
+		store.append((0,), (1,), 5, 1, 0.5)
+		store.append((1,), (2,), 6, 1, 0.25)
+		size = os.path.getsize(self.filename)
+		with open(self.filename, 'a') as f:
+			f.write('{"key": [2], "argum')
+		store = CheckpointStore(self.filename, resume = True)
+		self.assertEqual(sorted(store.records.keys()), [(0,), (1,)])
+		self.assertEqual(store.result((1,)), 0.25)
+		self.assertEqual(os.path.getsize(self.filename), size)
+		store.append((2,), (3,), 7, 1, 0.125)
+		self.assertEqual(len(CheckpointStore(self.filename, resume = True).records), 3)
+
+
+	def testNoOverwrite(self):
+		"""
+		A file with records is never truncated without resume, and cells
+		run with other parameters are refused.
+		"""
+
+		store = CheckpointStore(self.filename)
+		store.append((0,), (1,), 5, 1, 0.5)
+		self.assertRaises(CheckpointError, CheckpointStore, self.filename)
+		self.assertEqual(len(CheckpointStore(self.filename, resume = True).records), 1)
+		store = CheckpointStore(self.filename, resume = True)
+		self.assertRaises(CheckpointError, store.done, (0,), (2,), 5)
+		self.assertRaises(CheckpointError, store.done, (0,), (1,), 6)
+		empty = os.path.join(self.folder, 'empty.jsonl')
+		open(empty, 'w').close()
+		self.assertEqual(len(CheckpointStore(empty).records), 0)
+
+
+	def testOptIn(self):
+		"""
+		Only a checkpoint or resume writes a file, named after the plot by default.
+		"""
+
+		name = os.path.join(self.folder, 'plot')
+		store, seed = openCheckpoint(SweepOptions(seed = 1), name)
+		self.assertEqual((store, seed), (None, 1))
+		self.assertEqual(os.listdir(self.folder), [])
+		store, seed = openCheckpoint(SweepOptions(seed = 1, resume = True), name)
+		self.assertEqual(store.filename, name + '.jsonl')
+		sweep(drawExperiment, [((0,), (1,))], seed = seed, store = store)
+		store, seed = openCheckpoint(SweepOptions(resume = True), name)
+		self.assertEqual(seed, 1)
+		self.assertRaises(CheckpointError, openCheckpoint, SweepOptions(seed = 2, resume = True), name)
+		self.assertRaises(CheckpointError, openCheckpoint, SweepOptions(seed = 1, checkpoint = name + '.jsonl'), name)
+
+
+if __name__ == '__main__':
+	unittest.main()
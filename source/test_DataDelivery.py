@@ -0,0 +1,196 @@
+"""
+Tests of the DDLP instance class (DataDelivery), on small random instances.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+import numpy as np
+from DataDelivery import DataDelivery, ActiveRegion, dataTriangle
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def randomRobots(rng, n, width = 1.0, radius = 0.4):
+	"""
+	Returns n random robots (x_i, rho_i), sorted by x_i - rho_i.
+	"""
+
+	robots = [(rng.uniform(0, width), rng.uniform(0, radius)) for i in range(n)]
+	robots.sort(key = lambda robot: robot[0] - robot[1])
+
+	return robots
+
+
+def landing(data, robot):
+	"""
+	Data's position after robot moves it, straight from the definition.
+	"""
+
+	distance = abs(data - robot[0])
+	if distance < robot[1]:
+		return data + (robot[1] - distance)
+
+	return data
+
+
+def spent(ddlp_instance):
+	"""
+	Returns the indices of the robots that have spent their energy.
+	"""
+
+	return [i for i in range(len(ddlp_instance.robotsList())) if ddlp_instance.isEmpty(i)]
+
+#******************************************************************************
+# DATA DELIVERY TESTS
+#******************************************************************************
+
+class DataDeliveryTest(unittest.TestCase):
+	"""
+	Moves, undo log and energy stamps.
+	"""
+
+	def testMoves(self):
+		"""
+		Every move lands the data as the definition, robots move only once.
+		"""
+
+		rng = random.Random(1)
+		for trial in range(200):
+			robots = randomRobots(rng, rng.randint(1, 8))
+			ddlp_instance = DataDelivery(robots, data = rng.uniform(0, 0.5))
+			data = ddlp_instance.data()
+			used = set()
+			for step in range(10):
+				i = rng.randrange(len(robots))
+				if i not in used:
+					expected = landing(data, robots[i])
+					if expected != data:
+						used.add(i)
+					data = expected
+				ddlp_instance.move(i)
+				self.assertEqual(ddlp_instance.data(), data)
+				self.assertEqual(ddlp_instance.isEmpty(i), i in used)
+
+
+	def testUndo(self):
+		"""
+		rewind and reset restore data's position and the energies.
+		"""
+
+		rng = random.Random(2)
+		for trial in range(200):
+			robots = randomRobots(rng, rng.randint(1, 8))
+			ddlp_instance = DataDelivery(robots, data = 0.1)
+			certificate = [rng.randrange(len(robots)) for step in range(6)]
+			ddlp_instance.moveRobots(certificate[:3])
+			data = ddlp_instance.data()
+			empty = [ddlp_instance.isEmpty(i) for i in range(len(robots))]
+			mark = len(ddlp_instance.trail)
+			ddlp_instance.moveRobots(certificate[3:])
+			ddlp_instance.rewind(mark)
+			self.assertEqual(ddlp_instance.data(), data)
+			self.assertEqual([ddlp_instance.isEmpty(i) for i in range(len(robots))], empty)
+			ddlp_instance.reset()
+			self.assertEqual(ddlp_instance.data(), 0.1)
+			self.assertFalse(any([ddlp_instance.isEmpty(i) for i in range(len(robots))]))
+
+
+	def testNumPyInput(self):
+		"""
+		A NumPy (n, 2) array gives the same instance as a list, with Python floats.
+		"""
+
+		rng = random.Random(3)
+		robots = randomRobots(rng, 8)
+		from_list = DataDelivery(robots, data = 0.1)
+		from_array = DataDelivery(np.array(robots), data = 0.1)
+		self.assertEqual(from_array.robotsList(), from_list.robotsList())
+		self.assertTrue(isinstance(from_array.robot(0)[0], float))
+		certificate = range(8)
+		from_list.moveRobots(certificate)
+		from_array.moveRobots(certificate)
+		self.assertEqual(from_array.data(), from_list.data())
+
+
+#******************************************************************************
+# ACTIVE REGION TESTS
+#******************************************************************************
+
+class ActiveRegionTest(unittest.TestCase):
+	"""
+	The incremental index against dataTriangle, along random walks with backtracking.
+	"""
+
+	def assertRegion(self, region, ddlp_instance):
+		"""
+		Checks triangles, key, energy and reach against a computation from scratch.
+		"""
+
+		robots = ddlp_instance.robotsList()
+		data = ddlp_instance.data()
+		index = dict([(robots[i], i) for i in range(len(robots))])
+		removed = set(spent(ddlp_instance))
+		remaining = [robot for robot in robots if index[robot] not in removed]
+		left, right = dataTriangle(data, remaining)
+		self.assertEqual(region.leftTriangle(), sorted([index[robot] for robot in left]))
+		self.assertEqual(region.rightTriangle(), sorted([index[robot] for robot in right]))
+		alive = [i for i in range(len(robots)) if robots[i][0] + robots[i][1] > data]
+		self.assertEqual(region.key, sum([1 << i for i in alive if i in removed]))
+		energy = sum([robots[i][1] for i in alive if i not in removed])
+		self.assertAlmostEqual(region.energy, energy)
+		reach = [robots[i][0] + robots[i][1] for i in alive if i not in removed]
+		self.assertEqual(region.reach(), max(reach) if reach else data)
+
+
+	def testRandomWalks(self):
+		"""
+		Moves robots of the triangles, undoing some of the moves with pop().
+		"""
+
+		rng = random.Random(5)
+		for trial in range(300):
+			robots = randomRobots(rng, rng.randint(1, 8))
+			ddlp_instance = DataDelivery(robots, data = rng.uniform(0, 0.5))
+			region = ActiveRegion(ddlp_instance)
+			self.assertRegion(region, ddlp_instance)
+			marks = []
+			for step in range(12):
+				candidates = region.leftTriangle() + region.rightTriangle()
+				if marks and (not candidates or rng.random() < 0.3):
+					ddlp_instance.rewind(marks.pop())
+					region.pop()
+				elif candidates:
+					robot = rng.choice(candidates)
+					marks.append(len(ddlp_instance.trail))
+					region.push()
+					ddlp_instance.move(robot)
+					region.remove(robot)
+					region.update(ddlp_instance.data())
+				self.assertRegion(region, ddlp_instance)
+
+	def testSpentRobots(self):
+		"""
+		A region built after some moves leaves out the robots already spent.
+		"""
+
+		rng = random.Random(4)
+		for trial in range(300):
+			robots = randomRobots(rng, rng.randint(1, 8))
+			ddlp_instance = DataDelivery(robots, data = rng.uniform(0, 0.5))
+			ddlp_instance.moveRobots([rng.randrange(len(robots)) for step in range(3)])
+			self.assertRegion(ActiveRegion(ddlp_instance), ddlp_instance)
+			spent_robots = [ddlp_instance.isEmpty(i) for i in range(len(robots))]
+			copy = DataDelivery(robots, data = ddlp_instance.data(), energy = spent_robots)
+			self.assertRegion(ActiveRegion(copy), copy)
+
+
+
+if __name__ == '__main__':
+	unittest.main()
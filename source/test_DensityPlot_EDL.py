@@ -0,0 +1,143 @@
+"""
+Tests of the critical radius and critical number of robots experiments of
+DensityPlot_EDL against a scan of the radii and of the prefixes.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import unittest
+import numpy as np
+from DDLP_Bounds import reached
+from DDLP_Random import makeGenerator, uniforms, scaledBatch
+from DensityPlot_EDL import CriticalRadius, CriticalRobots, certify, argumentParser, criticalArguments, checkCritical
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def scanRadius(sample, source, target, width, grid):
+	"""
+	Smallest radius of grid at which the sample (a (1, n, 2) draw of
+	uniforms) is solvable, inf if none.
+	"""
+
+	for radius in grid:
+		if len(certify(scaledBatch(sample, width, radius)[0], source, target)) > 0:
+			return radius
+
+	return float('inf')
+
+
+def scanPrefixes(stream, source, target, min_n, max_n):
+	"""
+	Smallest n in [min_n, max_n] such that the first n robots of stream are
+	solvable, inf if none.
+	"""
+
+	for n in range(min_n, max_n + 1):
+		if reached(source, target) or len(certify(stream[:n], source, target)) > 0:
+			return n
+
+	return float('inf')
+
+
+def windowCertify(robots, source, target):
+	"""
+	A certify that is not monotone in the radius: solvable only if the
+	largest energy is in [0.2, 0.4).
+	"""
+
+	if 0.2 <= max([robot[1] for robot in robots]) < 0.4:
+		return [0]
+
+	return []
+
+#******************************************************************************
+# CRITICAL RADIUS TESTS
+#******************************************************************************
+
+class CriticalRadiusTest(unittest.TestCase):
+	"""
+	The bisection on the radius against a fine grid of radii.
+	"""
+
+	def testScan(self):
+		"""
+		Every critical radius is within the step of the grid and the precision.
+		"""
+
+		step, precision = 0.01, 0.002
+		grid = [step*(k + 1) for k in range(100)]
+		radii = [0.2, 0.6, 1.0]
+		for n in [2, 5, 8]:
+			experiment = CriticalRadius(certify, 0.0, precision, check = True)
+			critical = experiment(0.05, 0.95, 1.0, radii, n, 20, generator = makeGenerator(n))
+			units = uniforms(makeGenerator(n), (20, n, 2))
+			expected = sorted([scanRadius(units[t:t+1], 0.05, 0.95, 1.0, grid) for t in range(20)])
+			self.assertEqual(len(critical), 20)
+			self.assertEqual(critical, sorted(critical))
+			for k in range(20):
+				if np.isinf(expected[k]):
+					self.assertTrue(np.isinf(critical[k]))
+				else:
+					self.assertTrue(expected[k] - step < critical[k] < expected[k] + precision)
+
+
+	def testCheck(self):
+		"""
+		The check finds the samples that are not monotone in the radius.
+		"""
+
+		radii = [0.1*(k + 1) for k in range(10)]
+		experiment = CriticalRadius(windowCertify, 0.0, 0.01, check = True)
+		self.assertRaises(ValueError, experiment, 0.05, 0.95, 1.0, radii, 5, 10, generator = makeGenerator(1))
+		experiment = CriticalRadius(windowCertify, 0.0, 0.01)
+		self.assertEqual(len(experiment(0.05, 0.95, 1.0, radii, 5, 10, generator = makeGenerator(1))), 10)
+
+
+#******************************************************************************
+# CRITICAL ROBOTS TESTS
+#******************************************************************************
+
+class CriticalRobotsTest(unittest.TestCase):
+	"""
+	The bisection on the prefixes against a scan of every prefix.
+	"""
+
+	def testScan(self):
+		"""
+		The same critical numbers of robots as the scan.
+		"""
+
+		for radius in [0.1, 0.3, 0.6]:
+			for min_n in [0, 4]:
+				critical = CriticalRobots(certify)(0.05, 0.95, 1.0, radius, min_n, 16, 20, generator = makeGenerator(7))
+				stream = uniforms(makeGenerator(7), (20, 16, 2))*np.array([1.0, radius])
+				expected = sorted([scanPrefixes(stream[t], 0.05, 0.95, min_n, 16) for t in range(20)])
+				self.assertEqual(critical, expected)
+		critical = CriticalRobots(certify)(0.5, 0.5, 1.0, 0.1, 3, 16, 5, generator = makeGenerator(7))
+		self.assertEqual(critical, [3]*5)
+
+
+class ArgumentsTest(unittest.TestCase):
+
+	def testCombinations(self):
+		"""
+		The combinations that the critical modes ignore are rejected.
+		"""
+
+		parser = argumentParser(criticalArguments)
+		grid = ['1', '0', '1', '0', '6', '3', '0.05']
+		for extra in [[], ['--critical'], ['--nested'], ['--critical', '--check', '--precision', '0.1'], ['--refine', '1']]:
+			checkCritical(parser, parser.parse_args(grid + extra))
+		for extra in [['--critical', '--nested'], ['--check'], ['--precision', '0.1'], ['--nested', '--refine', '1'], ['--critical', '--ci-width', '0.2']]:
+			self.assertRaises(SystemExit, checkCritical, parser, parser.parse_args(grid + extra))
+		self.assertRaises(SystemExit, argumentParser().parse_args, grid + ['--critical'])
+
+
+if __name__ == '__main__':
+	unittest.main()
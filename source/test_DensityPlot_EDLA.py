@@ -0,0 +1,89 @@
+"""
+Tests of the FDDLP solvers of DensityPlot_EDLA against a brute force search.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+import numpy as np
+from DataDelivery import DataDelivery
+from DensityPlot_EDLA import polinomialEDLA, batchEDLA
+from test_DataDelivery import randomRobots
+
+TRIALS = 300 # number of random instances of every test
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def bruteReachEDLA(robots, source):
+	"""
+	Farthest position of the data over all the sequences of distinct robots,
+	a robot passed by the data carries it to x_i + rho_i.
+	"""
+
+	def search(data, used):
+		best = data
+		for i in range(len(robots)):
+			x, rho = robots[i]
+			if i not in used and x <= data < x + rho:
+				best = max(best, search(x + rho, used | set([i])))
+		return best
+
+	return search(source, set())
+
+#******************************************************************************
+# FDDLP TESTS
+#******************************************************************************
+
+class EDLATest(unittest.TestCase):
+	"""
+	The single instance and the batch solvers agree with the brute force.
+	"""
+
+	def testBruteForce(self):
+		"""
+		Random targets on both sides of the farthest reach, certificates are valid.
+		"""
+
+		rng = random.Random(17)
+		for trial in range(TRIALS):
+			robots = randomRobots(rng, rng.randint(1, 6))
+			farthest = bruteReachEDLA(robots, 0.2)
+			target = farthest
+			while abs(target - farthest) < 1e-6:
+				target = rng.uniform(0.2, 2*farthest - 0.2 + 0.01)
+			solvable = target < farthest
+			ddlp_instance = DataDelivery(robots, 0.2)
+			certificate = polinomialEDLA(ddlp_instance, target)
+			self.assertEqual(ddlp_instance.data(), 0.2)
+			self.assertEqual(len(certificate) > 0, solvable)
+			data = 0.2
+			for i in certificate:
+				x, rho = robots[i]
+				self.assertTrue(x <= data < x + rho)
+				data = x + rho
+			self.assertEqual(data > target, solvable)
+
+
+	def testBatch(self):
+		"""
+		A batch of unsorted instances at once.
+		"""
+
+		generator = np.random.RandomState(18)
+		batch = generator.random_sample((TRIALS, 6, 2))*[1.0, 0.4]
+		solvable = batchEDLA(batch, 0.2, 0.7)
+		for trial in range(TRIALS):
+			robots = [tuple(robot) for robot in batch[trial]]
+			self.assertEqual(solvable[trial], bruteReachEDLA(robots, 0.2) >= 0.7)
+		self.assertTrue(0 < solvable.sum() < TRIALS)
+
+
+if __name__ == '__main__':
+	unittest.main()
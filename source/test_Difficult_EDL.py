@@ -0,0 +1,127 @@
+"""
+Tests of the solver cascade of Difficult_EDL against running every solver
+on every instance.
+
+Run from the source folder with: python -m unittest discover
+
+Created: October 17th 2026
+"""
+
+__author__ = 'Caleb Andrade'
+
+import random
+import unittest
+from math import log
+from DataDelivery import DataDelivery, objectiveValue
+from DDLP_Bounds import EPSILON, infeasibilityReason
+from DDLP_Random import randomRobotBatch, makeGenerator
+from DDLP_ReverseHeuristic import reverseHeuristic, REVERSE_KEYS
+from DDLP_Heuristic import greedyHeuristic
+from DensityPlot_EDL import certify
+from Difficult_EDL import Cascade, PIPELINE, stages, solves
+
+#******************************************************************************
+# HELPER FUNCTIONS
+#******************************************************************************
+
+def everySolver(source, target, width, radius, n, seed):
+	"""
+	Runs every heuristic and backtrack on the instance of seed.
+	Output: dictionary {heuristic: did it find a valid certificate?},
+	whether the instance is solvable, and the instance.
+	"""
+
+	robots = randomRobotBatch(width, radius, n, 1, makeGenerator(seed))[0]
+	ddlp_instance = DataDelivery(robots, data = source)
+	found = {}
+	random.seed(seed)
+	for heuristic_type in PIPELINE[1:-1]:
+		if heuristic_type in REVERSE_KEYS:
+			certificate, targets = reverseHeuristic(ddlp_instance.robotsList(), heuristic_type, source, target)
+		else:
+			certificate, data = greedyHeuristic(ddlp_instance, heuristic_type)
+		found[heuristic_type] = solves(ddlp_instance, certificate, target)
+
+	return found, len(certify(robots, source, target)) > 0, ddlp_instance
+
+
+def difficultCells():
+	"""
+	Cells (radius, n, seed) of the difficult band log(n)/n <= r <= 2 log(n)/n.
+	"""
+
+	cells = []
+	for n in range(3, 21):
+		for k in range(4):
+			cells.append(((1 + k/3.0)*log(n)/n, n, 100*n + k))
+
+	return cells
+
+#******************************************************************************
+# CASCADE TESTS
+#******************************************************************************
+
+class CascadeTest(unittest.TestCase):
+	"""
+	The cascade decides and compares like running every solver.
+	"""
+
+	def testEverySolver(self):
+		"""
+		The same answer and hamming distances, decided by the first stage that can.
+		"""
+
+		stages_used = set()
+		for radius, n, seed in difficultCells():
+			found, yes_instance, ddlp_instance = everySolver(0.05, 0.95, 1.0, radius, n, seed)
+			random.seed(seed)
+			hamming_distance, answer, stage = Cascade()(0.05, 0.95, 1.0, radius, n, generator = makeGenerator(seed))
+			self.assertEqual(answer, yes_instance)
+			self.assertEqual(hamming_distance, [int(found[heuristic_type] != yes_instance) for heuristic_type in PIPELINE[1:-1]])
+			stages_used.add(stage)
+			rejected = infeasibilityReason(ddlp_instance.robotsList(), 0.05, 0.95) != None
+			if stage == 'bounds':
+				self.assertTrue(rejected)
+			else:
+				self.assertFalse(rejected)
+				before = PIPELINE[1:PIPELINE.index(stage)]
+				self.assertFalse(any([found[heuristic_type] for heuristic_type in before]))
+				if stage != 'backtrack':
+					self.assertTrue(found[stage])
+		self.assertTrue('bounds' in stages_used and 'backtrack' in stages_used and len(stages_used) > 2)
+
+
+	def testPipelines(self):
+		"""
+		Other pipelines give the same answers, invalid ones are refused.
+		"""
+
+		pipelines = [['backtrack'], ['quotient', 'backtrack', 'bounds'], ['bounds', 'hlr', 'backtrack', 'random_sampling']]
+		for radius, n, seed in difficultCells()[::5]:
+			answer = Cascade()(0.05, 0.95, 1.0, radius, n, generator = makeGenerator(seed))[1]
+			for pipeline in pipelines:
+				cascade = Cascade(pipeline)
+				result = cascade(0.05, 0.95, 1.0, radius, n, generator = makeGenerator(seed))
+				self.assertEqual(result[1], answer)
+				self.assertEqual(len(result[0]), len(cascade.heuristics))
+		self.assertEqual(sorted(stages()), sorted(PIPELINE))
+		self.assertRaises(ValueError, Cascade, ['bounds', 'hlr'])
+		self.assertRaises(ValueError, Cascade, ['unknown', 'backtrack'])
+
+
+	def testSolves(self):
+		"""
+		Valid certificates up to the margin EPSILON.
+		"""
+
+		ddlp_instance = DataDelivery([(0.2, 0.3), (0.6, 0.4)], data = 0.1)
+		data = objectiveValue(ddlp_instance, [0, 1])
+		self.assertTrue(solves(ddlp_instance, [0, 1], data))
+		self.assertTrue(solves(ddlp_instance, [0, 1], data*(1 + EPSILON/2)))
+		self.assertFalse(solves(ddlp_instance, [0, 1], data*(1 + 2*EPSILON)))
+		self.assertFalse(solves(ddlp_instance, [], 0.1))
+		self.assertEqual(ddlp_instance.data(), 0.1)
+
+
+if __name__ == '__main__':
+	unittest.main()